@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_configure.py — End-to-End-Benchmark für scripts/configure.py auf synthetischen Kursen.
+
+Ablauf je Wiederholung (frische Kopie eines einmal erzeugten Baums, siehe synth_course.py):
+  cold     erster Lauf auf unkonfigurierten Quellen (voller Lauf)
+  warm     zweiter voller Lauf (Quellen bereits konfiguriert, Dateicache warm)
+  prime    erster Lauf mit --incremental (schreibt das Manifest)
+  noop     zweiter Lauf mit --incremental (nichts geändert → Schnellpfad)
+
+Gemessen: Wall-Zeit des Prozesses, Peak-RSS (os.wait4), Phasen aus configure.events.jsonl.
+Ergebnis als JSON (--out); mit --compare ALT.json werden Abweichungen ausgegeben,
+mit --budget-ms schlägt der Lauf fehl (Exit 1), wenn der Median von cold darüber liegt.
+
+Beispiele:
+  python3 benchmarks/bench_configure.py --sessions 50 --pages 40 --out bench.json
+  python3 benchmarks/bench_configure.py --sessions 100 --pages 50 --compare bench.json --budget-ms 5000
+"""
+
+from pathlib import Path
+from datetime import datetime
+import argparse, json, os, platform, shutil, statistics, subprocess, sys, tempfile, time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from synth_course import generate  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+SCENARIOS = [("cold", []), ("warm", []), ("prime", ["--incremental"]), ("noop", ["--incremental"])]
+
+def run_configure(tree: Path, extra: list[str], jobs: int | None) -> dict:
+    """configure.py als Kindprozess; liefert Wall-Zeit, Peak-RSS und Phasen-Events."""
+    cmd = [sys.executable, str(tree / "scripts" / "configure.py"), "--noninteractive", *extra]
+    if jobs is not None:
+        cmd += ["--jobs", str(jobs)]
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=tree, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if hasattr(os, "wait4"):
+        _, status, ru = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - t0
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss: Linux KiB, macOS Bytes
+        rss_kb = ru.ru_maxrss // 1024 if sys.platform == "darwin" else ru.ru_maxrss
+    else:
+        proc.wait()
+        wall, rss_kb = time.perf_counter() - t0, None
+    err = proc.stderr.read().decode("utf-8", "replace")
+    proc.stderr.close()
+    if proc.returncode != 0:
+        raise SystemExit(f"❌ configure.py fehlgeschlagen ({proc.returncode}):\n{err}")
+
+    phases = {}
+    events = tree / "configure.events.jsonl"
+    if events.exists():
+        for line in events.read_text(encoding="utf-8").splitlines():
+            e = json.loads(line)
+            if e.get("event") == "phase":
+                phases[e["phase"]] = {k: e[k] for k in ("wall_ms", "cpu_ms", "files",
+                                                        "bytes_read", "bytes_written", "replacements")}
+    return {"wall_ms": round(wall * 1000, 3), "max_rss_kb": rss_kb, "phases": phases}
+
+def _median_run(runs: list[dict]) -> dict:
+    """Median über Wiederholungen (gesamt + je Phase)."""
+    out = {"wall_ms": statistics.median(r["wall_ms"] for r in runs),
+           "max_rss_kb": max((r["max_rss_kb"] or 0) for r in runs) or None,
+           "samples": [r["wall_ms"] for r in runs], "phases": {}}
+    names = [n for r in runs for n in r["phases"]]
+    for name in dict.fromkeys(names):
+        vals = [r["phases"][name] for r in runs if name in r["phases"]]
+        out["phases"][name] = {k: statistics.median(v[k] for v in vals) for k in vals[0]}
+    return out
+
+def _git_rev() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_table(result: dict, baseline: dict | None = None) -> None:
+    print(f"{'Szenario':<8} {'wall ms':>10} {'RSS MB':>8}   langsamste Phase")
+    for name, r in result["runs"].items():
+        slow = max(r["phases"].items(), key=lambda kv: kv[1]["wall_ms"], default=(None, None))
+        rss = f"{r['max_rss_kb']/1024:.1f}" if r["max_rss_kb"] else "-"
+        line = f"{name:<8} {r['wall_ms']:>10.1f} {rss:>8}   "
+        line += f"{slow[0]} ({slow[1]['wall_ms']:.1f} ms)" if slow[0] else "-"
+        if baseline and name in baseline.get("runs", {}):
+            old = baseline["runs"][name]["wall_ms"]
+            line += f"   Δ {r['wall_ms'] - old:+.1f} ms ({(r['wall_ms'] / old - 1) * 100 if old else 0:+.0f} %)"
+        print(line)
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark configure.py on a synthetic course tree.")
+    p.add_argument("--sessions", type=int, default=20, help="Anzahl Sitzungen (N)")
+    p.add_argument("--pages", type=int, default=25, help="Seiten pro Sitzung (M)")
+    p.add_argument("--page-kb", type=int, default=0, help="Seiten bis auf diese Größe (KiB) auffüllen")
+    p.add_argument("--docs-files", type=int, default=200, help="Ballast-Dateien unter docs/")
+    p.add_argument("--repeat", type=int, default=3, help="Wiederholungen (Median zählt)")
+    p.add_argument("--jobs", type=int, default=None, help="an configure.py durchreichen")
+    p.add_argument("--out", default=None, help="Ergebnis-JSON (Default: benchmarks/results/<Zeitstempel>.json)")
+    p.add_argument("--compare", default=None, help="früheres Ergebnis-JSON zum Vergleich")
+    p.add_argument("--budget-ms", type=float, default=None, help="Exit 1, wenn cold-Median darüber liegt")
+    p.add_argument("--keep", action="store_true", help="Arbeitsverzeichnis nicht löschen")
+    a = p.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="bench-configure-"))
+    try:
+        pristine = work / "pristine"
+        info = generate(pristine, a.sessions, a.pages, a.page_kb, a.docs_files)
+        print(f"🏗  {info['qmd_files']} Seiten, {info['qmd_bytes']/1e6:.1f} MB → {pristine}")
+
+        samples: dict[str, list[dict]] = {name: [] for name, _ in SCENARIOS}
+        for i in range(a.repeat):
+            tree = work / f"run-{i}"
+            shutil.copytree(pristine, tree, symlinks=True)
+            for name, extra in SCENARIOS:
+                samples[name].append(run_configure(tree, extra, a.jobs))
+            if not a.keep:
+                shutil.rmtree(tree)
+
+        result = {
+            "meta": {"date": datetime.now().isoformat(timespec="seconds"), "git": _git_rev(),
+                     "python": platform.python_version(), "platform": platform.platform(),
+                     "cpu_count": os.cpu_count(), "repeat": a.repeat, "jobs": a.jobs, **info},
+            "runs": {name: _median_run(runs) for name, runs in samples.items()},
+        }
+    finally:
+        if not a.keep:
+            shutil.rmtree(work, ignore_errors=True)
+
+    baseline = json.loads(Path(a.compare).read_text(encoding="utf-8")) if a.compare else None
+    print_table(result, baseline)
+
+    out = Path(a.out) if a.out else ROOT / "benchmarks" / "results" / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    print(f"🧾 Ergebnis geschrieben nach: {out}")
+
+    if a.budget_ms is not None and result["runs"]["cold"]["wall_ms"] > a.budget_ms:
+        print(f"❌ Budget überschritten: cold {result['runs']['cold']['wall_ms']:.1f} ms > {a.budget_ms:.1f} ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_placeholders.py — Micro-Benchmark: Platzhalter-Ersetzung in configure.py.
+
+Vergleicht die frühere Schleife (ein str.replace-Durchlauf pro Key) mit
+substitute_placeholders() (ein kompilierter Regex, ein Scan pro Text) auf
+einem synthetischen Korpus im Speicher.
+
+Beispiele:
+  python3 benchmarks/bench_placeholders.py
+  python3 benchmarks/bench_placeholders.py --pages 5000 --kb 16 --repeat 5
+"""
+
+from pathlib import Path
+import argparse, importlib.util, random, time
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def load_configure():
+    """configure.py als Modul laden (CLI wird erst in dessen main() verarbeitet)."""
+    spec = importlib.util.spec_from_file_location("configure", ROOT / "scripts" / "configure.py")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+def make_corpus(keys: list[str], pages: int, kb: int, seed: int = 1) -> list[str]:
+    rnd = random.Random(seed)
+    words = "Lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+    corpus = []
+    for _ in range(pages):
+        parts, size = [], 0
+        while size < kb * 1024:
+            if rnd.random() < 0.05:
+                piece = "{{" + rnd.choice(keys) + "}}"
+            else:
+                piece = rnd.choice(words)
+            parts.append(piece)
+            size += len(piece) + 1
+        corpus.append(" ".join(parts))
+    return corpus
+
+def loop_replace(text: str, repl: dict[str, str]) -> str:
+    for k, new in repl.items():
+        text = text.replace(f"{{{{{k}}}}}", new)
+    return text
+
+def timed(fn, corpus, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark placeholder substitution.")
+    p.add_argument("--pages", type=int, default=2000, help="Anzahl synthetischer Seiten")
+    p.add_argument("--kb", type=int, default=8, help="Größe pro Seite in KiB")
+    p.add_argument("--repeat", type=int, default=3, help="Wiederholungen (bestes Ergebnis zählt)")
+    a = p.parse_args()
+
+    cfg = load_configure()
+    keys = [k for k,_,_,_ in cfg.SCHEMA]
+    repl = {k: f"<{k}>" for k in keys}
+    corpus = make_corpus(keys, a.pages, a.kb)
+
+    # Ergebnisgleichheit sicherstellen, bevor gemessen wird
+    for text in corpus[:50]:
+        assert cfg.substitute_placeholders(text, repl)[0] == loop_replace(text, repl)
+
+    mb = sum(len(t) for t in corpus) / 1e6
+    t_loop = timed(lambda t: loop_replace(t, repl), corpus, a.repeat)
+    t_once = timed(lambda t: cfg.substitute_placeholders(t, repl), corpus, a.repeat)
+    print(f"Korpus: {a.pages} Seiten, {mb:.1f} MB, {len(keys)} Keys")
+    print(f"  str.replace-Schleife : {t_loop*1000:8.1f} ms")
+    print(f"  single pass (Regex)  : {t_once*1000:8.1f} ms  (×{t_loop/t_once:.2f})")
+
+if __name__ == "__main__":
+    main()
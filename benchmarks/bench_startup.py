@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_startup.py — Startkosten von scripts/configure.py (Interpreter + Imports + Config laden).
+
+In CI-Batches und pre-commit-Hooks ist configure.py fast immer schnell fertig; was zählt, ist
+der Prozessstart. Gemessen wird CPU-Zeit (user+sys, os.wait4) statt Wall-Zeit, weil sie auf
+geteilten Runnern deutlich weniger streut. Szenarien auf einem Mini-Kurs (synth_course.py):
+  python   nackter Interpreter (Untergrenze)
+  help     configure.py --help (volles argparse)
+  run      voller Lauf -n (Quellen bereits konfiguriert)
+  noop     --incremental ohne Änderungen (Schnellpfad)
+
+Zusätzlich: Module, die der noop-Lauf importiert, aber nicht sollte (yaml, argparse, …),
+und die teuersten Imports laut `-X importtime`.
+
+Beispiele:
+  python3 benchmarks/bench_startup.py
+  python3 benchmarks/bench_startup.py --repeat 40 --budget-ms 120
+"""
+
+from pathlib import Path
+import argparse, os, shutil, statistics, subprocess, sys, tempfile
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from synth_course import generate  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+SCENARIOS = [("python", None), ("help", ["--help"]), ("run", ["-n"]), ("noop", ["-n", "--incremental"])]
+# im Schnellpfad unnötig: nur bei verschachtelten Configs, --batch, -j bzw. vollem argparse
+# (hashlib fehlt hier bewusst: --incremental braucht den Config-Hash fürs Manifest)
+LAZY_MODULES = ("yaml", "argparse", "shutil", "multiprocessing", "concurrent.futures", "tempfile")
+
+def cpu_ms(cmd: list[str], cwd: Path) -> float:
+    """CPU-Zeit (user+sys) des Kindprozesses in ms."""
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, ru = os.wait4(proc.pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise SystemExit(f"❌ fehlgeschlagen: {' '.join(cmd)}")
+    return (ru.ru_utime + ru.ru_stime) * 1000
+
+def importtime(cmd: list[str], cwd: Path) -> dict[str, int]:
+    """Modul → kumulierte Importzeit in µs (aus -X importtime)."""
+    err = subprocess.run([sys.executable, "-X", "importtime", *cmd], cwd=cwd, capture_output=True,
+                         text=True).stderr
+    out = {}
+    for line in err.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = (part.strip() for part in line[12:].split("|"))
+            if cumulative.isdigit():
+                out[name.strip()] = int(cumulative)
+    return out
+
+def main():
+    if not hasattr(os, "wait4"):
+        raise SystemExit("❌ os.wait4 nicht verfügbar (nur Unix)")
+    p = argparse.ArgumentParser(description="Measure startup cost of configure.py.")
+    p.add_argument("--repeat", type=int, default=20, help="Wiederholungen je Szenario (Median zählt)")
+    p.add_argument("--top", type=int, default=8, help="teuerste Imports anzeigen")
+    p.add_argument("--budget-ms", type=float, default=None, help="Exit 1, wenn noop-Median (CPU) darüber liegt")
+    a = p.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="bench-startup-"))
+    try:
+        tree = work / "course"
+        generate(tree, 2, 3)
+        script = str(tree / "scripts" / "configure.py")
+        cpu_ms([sys.executable, script, "-n", "--incremental"], tree)   # konfigurieren + Manifest/Caches anlegen
+
+        print(f"{'Szenario':<8} {'CPU ms':>8} {'min':>8}")
+        medians = {}
+        for name, extra in SCENARIOS:
+            cmd = [sys.executable, "-c", "pass"] if extra is None else [sys.executable, script, *extra]
+            samples = [cpu_ms(cmd, tree) for _ in range(a.repeat)]
+            medians[name] = statistics.median(samples)
+            print(f"{name:<8} {medians[name]:>8.1f} {min(samples):>8.1f}")
+
+        times = importtime([script, "-n", "--incremental"], tree)
+        loaded = [m for m in LAZY_MODULES if m in times]
+        if loaded:
+            print(f"⚠️  noop importiert: {', '.join(loaded)}")
+        else:
+            print("✅ noop ohne " + ", ".join(LAZY_MODULES))
+        print("🔎 teuerste Imports (noop, kumuliert):")
+        for mod, us in sorted(times.items(), key=lambda kv: -kv[1])[:a.top]:
+            print(f"   {us/1000:>7.1f} ms  {mod}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    if a.budget_ms is not None and medians["noop"] > a.budget_ms:
+        print(f"❌ Budget überschritten: noop {medians['noop']:.1f} ms > {a.budget_ms:.1f} ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+synth_course.py — erzeugt einen synthetischen Kurs-Baum für Benchmarks.
+
+Basis ist das Template selbst: _quarto.yml, _quarto-ci.yml, site-config.yaml, css/*.scss,
+base/*.qmd (inkl. impressum.qmd), includes/, index.qmd und scripts/configure.py werden
+kopiert. Danach werden N Sitzungen × M Seiten aus den vorhandenen session-*/-Seiten
+vervielfältigt; Platzhalter ({{site_title}}, {{org_name}}, …) werden über die Seiten verteilt.
+Optional entsteht ein docs/-Baum mit gerendertem Ballast (prüft das Prunen der Discovery).
+
+Beispiele:
+  python3 benchmarks/synth_course.py /tmp/course --sessions 50 --pages 40
+  python3 benchmarks/synth_course.py /tmp/course --sessions 10 --pages 10 --page-kb 64 --docs-files 500
+"""
+
+from pathlib import Path
+import argparse, random, shutil
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Dateien/Ordner aus dem Template, die in jeden synthetischen Kurs kopiert werden
+TEMPLATE_FILES = ["_quarto.yml", "_quarto-ci.yml", "site-config.yaml", ".quartoignore",
+                  ".templateignore", "index.qmd"]
+TEMPLATE_DIRS  = ["css", "base", "includes"]
+QMD_PLACEHOLDERS = ["{{site_title}}", "{{org_name}}", "{{course_code}}", "{{contact_email}}"]
+
+def _split_front_matter(text: str) -> tuple[str, str]:
+    if text.startswith("---\n"):
+        end = text.find("\n---\n", 4)
+        if end != -1:
+            return text[:end + 5], text[end + 5:]
+    return "", text
+
+def _page_sources() -> list[tuple[str, str]]:
+    """(Front Matter, Body) aller vorhandenen Sitzungsseiten als Vorlage."""
+    out = []
+    for path in sorted(ROOT.glob("session-*/*.qmd")):
+        out.append(_split_front_matter(path.read_text(encoding="utf-8")))
+    return out or [("---\ntitle: \"Seite\"\n---\n", "Lorem ipsum dolor sit amet.\n")]
+
+def make_page(fm: str, body: str, s: int, pg: int, page_kb: int, rnd: random.Random,
+              density: float) -> str:
+    """
+    Eine Seite: Front Matter mit eindeutigem Titel, Body aus der Vorlage (ggf. bis page_kb
+    aufgefüllt). In ca. density aller Absätze wird ein Platzhalter eingestreut.
+    """
+    fm = fm.replace('title: "', f'title: "{{{{course_code}}}} {s}.{pg} – ', 1) if fm else \
+        f'---\ntitle: "{{{{course_code}}}} {s}.{pg}"\n---\n'
+    paras = [p for p in body.split("\n\n") if p.strip()]
+    out: list[str] = []
+    size, i = 0, 0
+    target = max(page_kb * 1024, len(body))
+    while size < target and paras:
+        para = paras[i % len(paras)]
+        if rnd.random() < density:
+            para = f"{para} {rnd.choice(QMD_PLACEHOLDERS)}"
+        out.append(para)
+        size += len(para) + 2
+        i += 1
+    return fm + "\n" + "\n\n".join(out) + "\n"
+
+def generate(dest: Path, sessions: int, pages: int, page_kb: int = 0, docs_files: int = 0,
+             density: float = 0.2, seed: int = 1) -> dict:
+    """Erzeugt den Baum unter dest (muss leer/nicht vorhanden sein). Rückgabe: Kennzahlen."""
+    dest.mkdir(parents=True, exist_ok=False)
+    for name in TEMPLATE_FILES:
+        if (ROOT / name).exists():
+            shutil.copy2(ROOT / name, dest / name)
+    for name in TEMPLATE_DIRS:
+        if (ROOT / name).is_dir():
+            shutil.copytree(ROOT / name, dest / name)
+    (dest / "scripts").mkdir()
+    shutil.copy2(ROOT / "scripts" / "configure.py", dest / "scripts" / "configure.py")
+
+    rnd = random.Random(seed)
+    sources = _page_sources()
+    n_files, n_bytes = 0, 0
+    for s in range(1, sessions + 1):
+        sdir = dest / f"session-{s}"
+        sdir.mkdir()
+        for pg in range(1, pages + 1):
+            fm, body = sources[(s + pg) % len(sources)]
+            text = make_page(fm, body, s, pg, page_kb, rnd, density)
+            (sdir / f"sitzung-{s}-{pg:02d}.qmd").write_text(text, encoding="utf-8")
+            n_files += 1
+            n_bytes += len(text.encode("utf-8"))
+
+    # Ballast im Output-Verzeichnis (darf von configure.py nie angefasst werden)
+    if docs_files:
+        ddir = dest / "docs"
+        for i in range(docs_files):
+            sub = ddir / f"session-{i % max(sessions, 1) + 1}"
+            sub.mkdir(parents=True, exist_ok=True)
+            (sub / f"page-{i}.html").write_text("<html><body>{{org_name}}</body></html>\n", encoding="utf-8")
+            (sub / f"page-{i}.qmd").write_text("{{org_name}}\n", encoding="utf-8")
+
+    return {"sessions": sessions, "pages": pages, "page_kb": page_kb, "docs_files": docs_files,
+            "qmd_files": n_files, "qmd_bytes": n_bytes}
+
+def main():
+    p = argparse.ArgumentParser(description="Generate a synthetic course tree from this template.")
+    p.add_argument("dest", help="Zielverzeichnis (darf noch nicht existieren)")
+    p.add_argument("--sessions", type=int, default=20, help="Anzahl Sitzungen (N)")
+    p.add_argument("--pages", type=int, default=25, help="Seiten pro Sitzung (M)")
+    p.add_argument("--page-kb", type=int, default=0, help="Seiten bis auf diese Größe (KiB) auffüllen")
+    p.add_argument("--docs-files", type=int, default=0, help="Anzahl Ballast-Dateien unter docs/")
+    p.add_argument("--density", type=float, default=0.2, help="Anteil der Absätze mit Platzhalter")
+    p.add_argument("--seed", type=int, default=1)
+    a = p.parse_args()
+    info = generate(Path(a.dest), a.sessions, a.pages, a.page_kb, a.docs_files, a.density, a.seed)
+    print(f"✅ {info['qmd_files']} Seiten ({info['qmd_bytes']/1e6:.1f} MB) → {a.dest}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+check_links.py — prüft offline, ob alle lokalen Links und Assets im Output (docs/) auflösen.
+
+• Index: alle Dateien im Output als Menge relativer Pfade (ein os.walk, kein Dateisystem-Zugriff
+    pro Link); Ordner-Links → <ordner>/index.html
+• Parser: html.parser im Streaming-Betrieb (Datei blockweise einlesen + gleichzeitig hashen);
+    erfasst href/src/srcset/poster/data-src samt Zeile sowie alle id-/name-Anker
+• Prüft: Zieldatei vorhanden, #Anker auf HTML-Zielen vorhanden (--no-fragments schaltet das ab),
+    absolute Links auf die eigene site-url (_quarto.yml) wie lokale Links, sitemap.xml-Einträge
+• Cache (.quarto/linkcheck-cache.json): Parse-Ergebnis je Datei-Hash → nur geänderte Seiten
+    werden neu gelesen; das Auflösen gegen den Index läuft immer komplett (billig, in-memory)
+• Parallel: Cache-Fehltreffer werden auf Prozesse verteilt (wie configure._map_files)
+
+Exit-Code 1, wenn mindestens ein Link nicht auflöst.
+
+Beispiele:
+  python3 scripts/check_links.py
+  python3 scripts/check_links.py --dir _site --jobs 4 --no-fragments
+"""
+
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+import argparse, codecs, hashlib, json, multiprocessing, os, sys, time
+import xml.etree.ElementTree as ET
+
+from configure import load_yaml, locate_project, write_text
+
+ROOT = Path(__file__).resolve().parents[1]
+PAGE_SUFFIXES = {".html", ".htm"}
+LINK_ATTRS = {"href", "src", "poster", "data-src"}
+SKIP_SCHEMES = {"mailto", "tel", "javascript", "data", "blob", "about"}
+CHUNK = 1 << 16
+CACHE_VERSION = 1
+PARALLEL_MIN_FILES = 32
+
+# ---------- Parser ----------
+class LinkParser(HTMLParser):
+    """Sammelt (Attribut, Wert, Zeile) und Anker-IDs; wird blockweise gefüttert."""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: list[tuple[str, str, int]] = []
+        self.ids: set[str] = set()
+
+    def handle_starttag(self, tag, attrs):
+        line = self.getpos()[0]
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name in LINK_ATTRS:
+                self.links.append((name, value, line))
+            elif name == "srcset":
+                for item in value.split(","):
+                    bits = item.split()
+                    if bits:
+                        self.links.append((name, bits[0], line))
+            elif name == "id" or (name == "name" and tag == "a"):
+                self.ids.add(value)
+
+    handle_startendtag = handle_starttag
+
+def parse_file(path: Path) -> dict:
+    """Eine Seite streamen: Hash + Links + Anker in einem Durchgang."""
+    h = hashlib.sha256()
+    parser = LinkParser()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK), b""):
+            h.update(chunk)
+            parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    st = path.stat()
+    return {"sha": h.hexdigest(), "size": st.st_size, "mtime": st.st_mtime_ns,
+            "links": parser.links, "ids": sorted(parser.ids)}
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _map_parse(paths: list[Path], jobs: int) -> list[dict]:
+    """parse_file für alle paths (fork-Prozess-Pool, sonst Threads; seriell bei wenigen Dateien)."""
+    if jobs <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        return [parse_file(p) for p in paths]
+    n = min(jobs, len(paths))
+    chunk = max(1, len(paths) // (n * 4))
+    if "fork" in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("fork")) as ex:
+            return list(ex.map(parse_file, paths, chunksize=chunk))
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        return list(ex.map(parse_file, paths))
+
+# ---------- Index + Cache ----------
+def build_index(out_dir: Path) -> tuple[set[str], list[str]]:
+    """(alle Dateien als relative POSIX-Pfade, davon die HTML-Seiten)."""
+    files: set[str] = set()
+    for dirpath, dirnames, filenames in os.walk(out_dir):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        rel_dir = Path(dirpath).relative_to(out_dir).as_posix()
+        prefix = "" if rel_dir == "." else rel_dir + "/"
+        files.update(prefix + name for name in filenames)
+    return files, sorted(f for f in files if os.path.splitext(f)[1].lower() in PAGE_SUFFIXES)
+
+def load_pages(out_dir: Path, pages: list[str], cache: dict, jobs: int) -> tuple[dict[str, dict], int]:
+    """Parse-Ergebnis je Seite; Cache-Treffer über (Größe, mtime) oder – falls berührt – Hash."""
+    result: dict[str, dict] = {}
+    todo: list[str] = []
+    for rel in pages:
+        entry = cache.get(rel)
+        if entry:
+            st = (out_dir / rel).stat()
+            if (entry["size"], entry["mtime"]) == (st.st_size, st.st_mtime_ns) or \
+                    (entry["size"] == st.st_size and entry["sha"] == _sha256_file(out_dir / rel)):
+                result[rel] = {**entry, "mtime": st.st_mtime_ns}
+                continue
+        todo.append(rel)
+    for rel, res in zip(todo, _map_parse([out_dir / r for r in todo], jobs)):
+        result[rel] = res
+    return result, len(todo)
+
+# ---------- Auflösen ----------
+def site_prefix(base: Path) -> str | None:
+    """site-url aus _quarto.yml (ohne Slash am Ende); Links darauf gelten als lokal."""
+    cfg = load_yaml(base / "_quarto.yml")
+    web = cfg.get("website")
+    url = (web.get("site-url") if isinstance(web, dict) else None) or cfg.get("site-url")
+    return str(url).rstrip("/") if url else None
+
+def resolve(ref: str, page: str, site: str | None) -> tuple[str, str] | None:
+    """Verweis einer Seite → (Zielpfad relativ zum Output, Fragment); extern/leer → None."""
+    ref = ref.strip()
+    if site and (ref == site or ref.startswith(site + "/")):
+        ref = "/" + ref[len(site):].lstrip("/")
+    parts = urlsplit(ref)
+    if parts.scheme or parts.netloc:
+        return None
+    if not parts.path:
+        return (page, parts.fragment) if parts.fragment else None
+    if parts.path.startswith("/"):
+        target = unquote(parts.path).lstrip("/")
+    else:
+        target = os.path.normpath(os.path.join(os.path.dirname(page), unquote(parts.path))).replace(os.sep, "/")
+    return target, parts.fragment
+
+def _lookup(target: str, files: set[str]) -> str | None:
+    if target in files:
+        return target
+    index = (target.rstrip("/") + "/index.html").lstrip("/") if target not in (".", "") else "index.html"
+    return index if index in files else None
+
+def check(pages: dict[str, dict], files: set[str], site: str | None, fragments: bool) -> list[tuple[str, int, str, str]]:
+    """Alle Links aller Seiten gegen den Index; Rückgabe: (Seite, Zeile, Verweis, Grund)."""
+    problems = []
+    ids = {rel: set(data["ids"]) for rel, data in pages.items()}
+    for rel, data in pages.items():
+        for attr, ref, line in data["links"]:
+            if urlsplit(ref.strip()).scheme in SKIP_SCHEMES or ref.strip() in ("", "#"):
+                continue
+            hit = resolve(ref, rel, site)
+            if hit is None:
+                continue
+            target, frag = hit
+            if target.startswith("../") or target == "..":
+                problems.append((rel, line, ref, "zeigt aus dem Output-Verzeichnis heraus"))
+                continue
+            found = _lookup(target, files)
+            if found is None:
+                problems.append((rel, line, ref, "Ziel fehlt"))
+            elif fragments and frag and attr == "href" and found in ids and unquote(frag) not in ids[found]:
+                problems.append((rel, line, ref, f"Anker #{unquote(frag)} fehlt in {found}"))
+    return problems
+
+def check_sitemap(out_dir: Path, files: set[str], pages: list[str], site: str | None) -> tuple[list[str], list[str]]:
+    """(Sitemap-Einträge ohne Datei, Seiten ohne Sitemap-Eintrag)."""
+    path = out_dir / "sitemap.xml"
+    if not path.is_file():
+        return [], []
+    ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+    locs = [el.text.strip() for el in ET.parse(path).getroot().findall("sm:url/sm:loc", ns) if el.text]
+    missing, listed = [], set()
+    for loc in locs:
+        hit = resolve(loc, "index.html", site)
+        found = _lookup(hit[0], files) if hit else None
+        if found is None:
+            missing.append(loc)
+        else:
+            listed.add(found)
+    # Quarto listet keine 404-Seite; alles andere sollte drinstehen
+    unlisted = [p for p in pages if p not in listed and os.path.basename(p) != "404.html"] if locs else []
+    return missing, unlisted
+
+# ---------- Lauf ----------
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Check that local links, assets and sitemap entries in the rendered site resolve.")
+    p.add_argument("--dir", default=None,
+                   help="Output-Verzeichnis (Default: $QUARTO_PROJECT_OUTPUT_DIR, sonst docs/)")
+    p.add_argument("--no-fragments", action="store_true", help="#Anker nicht prüfen")
+    p.add_argument("--no-sitemap", action="store_true", help="sitemap.xml nicht abgleichen")
+    p.add_argument("--no-cache", action="store_true", help="alle Seiten neu parsen")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="Worker-Anzahl (Default: CPU-Anzahl)")
+    a = p.parse_args(argv)
+
+    base = locate_project(ROOT) or ROOT
+    out_dir = Path(a.dir or os.environ.get("QUARTO_PROJECT_OUTPUT_DIR") or base / "docs").absolute()
+    if not out_dir.is_dir():
+        print(f"❌ Output-Verzeichnis nicht gefunden: {out_dir}")
+        return 1
+    jobs = max(1, a.jobs if a.jobs is not None else (os.cpu_count() or 1))
+    t0 = time.perf_counter()
+
+    cache_path = base / ".quarto" / "linkcheck-cache.json"
+    cache = {}
+    if not a.no_cache:
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+            cache = data.get("files", {}) if data.get("version") == CACHE_VERSION else {}
+        except (OSError, ValueError):
+            pass
+
+    files, page_list = build_index(out_dir)
+    pages, parsed = load_pages(out_dir, page_list, cache, jobs)
+    site = site_prefix(base)
+    problems = check(pages, files, site, not a.no_fragments)
+    missing, unlisted = ([], []) if a.no_sitemap else check_sitemap(out_dir, files, page_list, site)
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    write_text(cache_path, json.dumps({"version": CACHE_VERSION, "files": pages},
+                                      ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    links = sum(len(d["links"]) for d in pages.values())
+    print(f"🔗 {len(page_list)} Seiten, {links} Verweise, {len(files)} Dateien im Index"
+          f" ({parsed} neu geparst, {time.perf_counter() - t0:.2f} s, {jobs} Worker)")
+    for rel, line, ref, why in sorted(problems):
+        print(f"   ❌ {rel}:{line}  {ref}  → {why}")
+    for loc in missing:
+        print(f"   ❌ sitemap.xml: {loc}  → Ziel fehlt")
+    for rel in unlisted:
+        print(f"   ⚠️  {rel} fehlt in sitemap.xml")
+    errors = len(problems) + len(missing)
+    print(f"❌ {errors} defekte Verweise" if errors else "✅ Alle lokalen Verweise lösen auf")
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,76 +8,404 @@ configure.py — wendet site-config.yaml auf ein Quarto-Projekt an.
     --interactive / -i       fehlende Werte abfragen
     --noninteractive / -n    keine Rückfragen (Default)
     --config PATH            Pfad zur site-config.yaml (optional)
+    --incremental            nur geänderte Dateien bearbeiten (Manifest in .quarto/)
+    --jobs N / -j N          *.qmd parallel mit N Workern bearbeiten (Default: CPU-Anzahl)
+    --profile [PSTATS]       Zeit-Übersicht je Phase ausgeben; optional cProfile-Stats nach PSTATS
+    --batch PATH...          mehrere Sites in EINEM Prozess konfigurieren (Projekt-Roots,
+                             site-config.yaml-Dateien oder Ordner mit einem Projekt je Unterordner)
+    --batch-jobs N           Sites im Batch parallel bearbeiten (Default: 1)
+    --watch                  nach dem Lauf Änderungen beobachten (Polling) und nur die betroffenen
+                             Updates erneut anwenden; --watch-interval SEC, --debounce MS
+
+Neben configure.log entsteht configure.events.jsonl (ein JSON-Event pro Phase/Datei).
+*.qmd ab 4 MB werden blockweise ersetzt (Temp-Datei, fester Speicherbedarf statt Vielfachem der Dateigröße).
 
 Beispiele:
   python3 scripts/configure.py --interactive
   python3 scripts/configure.py --noninteractive --config ./site-config.yaml
+  python3 scripts/configure.py --incremental
+  python3 scripts/configure.py --profile configure.prof
+  python3 scripts/configure.py --batch ~/kurse --batch-jobs 4
+  python3 scripts/configure.py --watch
 """
 
+from __future__ import annotations   # Annotationen wie argparse.Namespace ohne Import zur Ladezeit
+
 from pathlib import Path
 from datetime import datetime
-from urllib.parse import urlparse
-import argparse, sys, re
+from fnmatch import fnmatchcase
+from bisect import bisect_right
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import lru_cache
+import json, os, stat, sys, re, time
+
+# Start-Zeit zählt (CI, pre-commit, --batch): argparse, hashlib, urllib.parse,
+# multiprocessing und concurrent.futures werden erst in den Funktionen importiert, die sie brauchen.
+# Messen: python3 -X importtime scripts/configure.py --help
+
+class _LazyRe:
+    """re.compile erst beim ersten Zugriff; danach direkt die Methoden des kompilierten Musters."""
+    def __init__(self, pattern: str, flags: int = 0):
+        self._args = (pattern, flags)
+
+    def __getattr__(self, name: str):
+        compiled = re.compile(*self._args)
+        for attr in ("sub", "subn", "match", "search", "finditer", "findall", "split", "fullmatch", "pattern"):
+            setattr(self, attr, getattr(compiled, attr))
+        return getattr(compiled, name)
 
 # ---------- CLI ----------
-p = argparse.ArgumentParser(description="Apply site-config.yaml to project files.")
-m = p.add_mutually_exclusive_group()
-m.add_argument("-i","--interactive", action="store_true", help="Ask for missing values.")
-m.add_argument("-n","--noninteractive", action="store_true", help="No prompts; fail if required are missing.")
-p.add_argument("-c","--config", default=None, help="Path to site-config.yaml")
-args = p.parse_args()
-NONINTERACTIVE = True if args.noninteractive or not args.interactive else False  # default non-interactive
+ARG_DEFAULTS = {"interactive": False, "noninteractive": False, "config": None, "incremental": False,
+                "jobs": None, "profile": None, "batch": None, "batch_jobs": 1, "watch": False,
+                "watch_interval": 0.1, "debounce": 200.0}
+# Reine Schalter ohne Wert: nur diese → Parser wird gar nicht gebaut (argparse + Help-Formatter
+# kosten mehr Startzeit als ein typischer CI-/pre-commit-Lauf selbst)
+_FAST_FLAGS = {"-n": "noninteractive", "--noninteractive": "noninteractive",
+               "--incremental": "incremental", "--watch": "watch"}
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    argv = sys.argv[1:] if argv is None else argv
+    if all(a in _FAST_FLAGS for a in argv):
+        from types import SimpleNamespace
+        return SimpleNamespace(**{**ARG_DEFAULTS, **{_FAST_FLAGS[a]: True for a in argv}})
+    import argparse
+    p = argparse.ArgumentParser(description="Apply site-config.yaml to project files.")
+    m = p.add_mutually_exclusive_group()
+    m.add_argument("-i","--interactive", action="store_true", help="Ask for missing values.")
+    m.add_argument("-n","--noninteractive", action="store_true", help="No prompts; fail if required are missing.")
+    p.add_argument("-c","--config", help="Path to site-config.yaml")
+    p.add_argument("--incremental", action="store_true", help="Only process files changed since the last run (manifest in .quarto/).")
+    p.add_argument("-j","--jobs", type=int, help="Worker count for *.qmd processing (default: CPU count).")
+    p.add_argument("--profile", nargs="?", const="", metavar="PSTATS",
+                   help="Print a per-phase timing summary; optionally dump cProfile stats to PSTATS.")
+    p.add_argument("--batch", nargs="+", metavar="PATH",
+                   help="Configure several sites in one process: project roots, site-config.yaml files "
+                        "or directories containing one project per subdirectory.")
+    p.add_argument("--batch-jobs", type=int, metavar="N",
+                   help="Sites processed in parallel in --batch mode (default: 1).")
+    p.add_argument("--watch", action="store_true",
+                   help="After a full run, watch site-config.yaml, _quarto.yml, css/*.scss and *.qmd "
+                        "and re-apply only the affected updates.")
+    p.add_argument("--watch-interval", type=float, metavar="SEC",
+                   help="Polling interval in --watch mode (default: 0.1).")
+    p.add_argument("--debounce", type=float, metavar="MS",
+                   help="Quiet period before changes are applied in --watch mode (default: 200).")
+    p.set_defaults(**ARG_DEFAULTS)
+    args = p.parse_args(argv)
+    if args.batch and args.config:
+        p.error("--config cannot be combined with --batch (pass site-config.yaml files to --batch instead)")
+    if args.batch and args.watch:
+        p.error("--watch cannot be combined with --batch")
+    return args
+
+class ConfigureError(Exception):
+    """Lauf nicht möglich (z. B. Pflichtwert fehlt); main() meldet und beendet mit Exit 1."""
 
 # ---------- locate project root/base ----------
-ROOT = Path(__file__).resolve().parents[1]
-if (ROOT / "_quarto.yml").exists():
-    BASE = ROOT
-elif (ROOT / "template" / "_quarto.yml").exists():
-    BASE = ROOT / "template"
-else:
-    print("❌ _quarto.yml not found (root or ./template).")
-    sys.exit(1)
+def locate_project(root: Path) -> Path | None:
+    """BASE zu einem Projekt-Root: root selbst oder root/template (je nachdem, wo _quarto.yml liegt)."""
+    if (root / "_quarto.yml").exists():
+        return root
+    if (root / "template" / "_quarto.yml").exists():
+        return root / "template"
+    return None
+
+def default_config_path(root: Path, base: Path) -> Path:
+    cfg_root, cfg_alt = root / "site-config.yaml", base / "site-config.yaml"
+    return cfg_root if cfg_root.exists() else (cfg_alt if cfg_alt.exists() else cfg_root)
+
+# ---------- Lauf-Kontext (statt Modul-Globals → main() mehrfach pro Prozess möglich) ----------
+class SiteRun:
+    """
+    Pfade, Optionen, Log und Events EINES Laufs gegen einen Projektbaum.
+    Der aktive Lauf steht in _RUN; _log()/phase()/emit_file() schreiben dorthin.
+    """
+    def __init__(self, root: Path, base: Path, cfg_path: Path, *, noninteractive: bool = True,
+                 incremental: bool = False, jobs: int = 1):
+        self.root, self.base, self.cfg_path = root, base, cfg_path
+        self.noninteractive, self.incremental, self.jobs = noninteractive, incremental, jobs
+        self.log_path = root / "configure.log"
+        self.events_path = root / "configure.events.jsonl"
+        self.manifest_path = base / ".quarto" / "configure-manifest.json"
+        self.log: list[str] = []
+        self.events: list[dict] = []
+        self.phases: list[dict] = []   # offene Phasen (innerste zuletzt)
+        self.t0, self.c0 = time.perf_counter(), time.process_time()
+
+_RUN: ContextVar[SiteRun | None] = ContextVar("configure_run", default=None)
 
 # ---------- logging (einfach) ----------
-LOG_PATH = ROOT / "configure.log"
-LOG: list[str] = []
-
 def _log(msg: str):
-    LOG.append(msg)
+    run = _RUN.get()
+    if run is not None:
+        run.log.append(msg)
 
-def _line_no_for_pos(text: str, pos: int) -> int:
-    return text.count("\n", 0, pos) + 1
+# ---------- Instrumentierung: strukturierte Events (JSON Lines) + Phasen-Timing ----------
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
 
-# ---------- config path ----------
-CFG_ROOT = ROOT / "site-config.yaml"
-CFG_ALT  = BASE / "site-config.yaml"
-CFG_PATH = Path(args.config) if args.config else (CFG_ROOT if CFG_ROOT.exists() else (CFG_ALT if CFG_ALT.exists() else CFG_ROOT))
+def _rel(path: Path) -> str:
+    run = _RUN.get()
+    try:
+        return path.relative_to(run.base).as_posix() if run else str(path)
+    except ValueError:
+        return str(path)
+
+@contextmanager
+def phase(name: str):
+    """Misst Wall-/CPU-Zeit einer Phase und summiert die Datei-Events darin."""
+    run = _RUN.get()
+    rec = {"event": "phase", "phase": name, "files": 0,
+           "bytes_read": 0, "bytes_written": 0, "replacements": 0}
+    if run:
+        run.phases.append(rec)
+    w0, c0 = time.perf_counter(), time.process_time()
+    try:
+        yield rec
+    finally:
+        rec["wall_ms"] = _ms(time.perf_counter() - w0)
+        rec["cpu_ms"]  = _ms(time.process_time() - c0)   # ohne CPU-Zeit von Worker-Prozessen
+        if run:
+            run.phases.pop()
+            rec["t_ms"] = _ms(w0 - run.t0)
+            run.events.append(rec)
+
+@contextmanager
+def file_stats(path: Path):
+    """
+    Zähler + Timing für EINE Datei. Reiner Record ohne globale Seiteneffekte → auch in
+    Worker-Prozessen nutzbar; gemeldet wird er im Hauptprozess über emit_file().
+    """
+    rec = {"file": _rel(path), "bytes_read": 0, "bytes_written": 0, "replacements": 0}
+    w0, c0 = time.perf_counter(), time.thread_time()
+    try:
+        yield rec
+    finally:
+        rec["wall_ms"] = _ms(time.perf_counter() - w0)
+        rec["cpu_ms"]  = _ms(time.thread_time() - c0)
+
+def emit_file(rec: dict) -> None:
+    run = _RUN.get()
+    if run is None:
+        return
+    cur = run.phases[-1] if run.phases else None
+    run.events.append({"event": "file", "phase": cur["phase"] if cur else None, **rec})
+    if cur:
+        cur["files"] += 1
+        for k in ("bytes_read", "bytes_written", "replacements"):
+            cur[k] += rec.get(k, 0)
+
+def write_run_logs(run: SiteRun) -> None:
+    """
+    configure.log + configure.events.jsonl in place schreiben (kein Temp-Datei + os.replace wie
+    write_text): ein Rename im Root ändert dessen mtime → der Verzeichnis-Check des
+    Discovery-Caches (_dirs_unchanged) schlüge bei jedem --incremental-Lauf fehl. Beide Dateien
+    sind keine Quarto-Eingaben, ein halb geschriebener Stand ist unkritisch.
+    """
+    with open(run.log_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(run.log) + "\n")
+    with open(run.events_path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(e, ensure_ascii=False) + "\n" for e in run.events)
+
+def write_counts(run: SiteRun) -> tuple[int, int]:
+    """(geschriebene, unverändert übersprungene) Zieldateien des Laufs."""
+    files = [e for e in run.events if e["event"] == "file" and e["phase"] != "load_yaml"]
+    touched = sum(1 for e in files if e["bytes_written"])
+    return touched, len(files) - touched
+
+def print_profile_summary(run: SiteRun) -> None:
+    rows = [e for e in run.events if e["event"] == "phase"]
+    print("⏱  Phase                      wall ms    cpu ms  files   read KB  written KB   repl")
+    for e in rows:
+        print(f"   {e['phase']:<24} {e['wall_ms']:>9.1f} {e['cpu_ms']:>9.1f} {e['files']:>6}"
+              f" {e['bytes_read']/1024:>9.1f} {e['bytes_written']/1024:>11.1f} {e['replacements']:>6}")
+    print(f"   {'gesamt':<24} {_ms(time.perf_counter() - run.t0):>9.1f} {_ms(time.process_time() - run.c0):>9.1f}")
+
+class LineIndex:
+    """
+    Zeilenanfänge eines Textes, EINMAL in O(n) erfasst; Position → Zeilennummer (1-basiert)
+    per bisect in O(log n). Ersetzt das Zählen der Zeilenumbrüche ab Offset 0 je Treffer.
+    """
+    __slots__ = ("starts",)
+
+    def __init__(self, text: str):
+        starts = [0]
+        find, pos = text.find, text.find("\n")
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find("\n", pos + 1)
+        self.starts = starts
+
+    def line(self, pos: int) -> int:
+        return bisect_right(self.starts, pos)
+
+# ---------- YAML load/save (flacher Schnellpfad → PyYAML → einfacher Fallback) ----------
+# Schnellpfad für flache "key: skalar"-Dateien wie site-config.yaml: liefert dasselbe wie
+# yaml.safe_load (YAML 1.1: yes/no/on/off → bool, ~/null/leer → None, Dezimalzahlen → int),
+# ohne PyYAML zu importieren. Alles, was er nicht sicher genauso lesen kann (Verschachtelung,
+# Listen, Anker, Block-Skalare, Floats/Datumswerte, Escapes, Tabs …), geht an PyYAML.
+_FLAT_LINE_RE     = _LazyRe(r"([A-Za-z_][\w.\-]*) *:(?: +(.*))?$")
+_FLAT_INT_RE      = _LazyRe(r"[-+]?(?:0|[1-9][0-9]*)$")
+_NON_PRINTABLE_RE = _LazyRe("[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x84\x86-\x9F\uD800-\uDFFF\uFFFE\uFFFF]")   # von PyYAML abgelehnt (wie Reader.NON_PRINTABLE, positiv formuliert → schnell kompiliert)
+_YAML_BOOL = {v: b for b, words in ((True, "yes true on"), (False, "no false off"))
+              for w in words.split() for v in (w, w.capitalize(), w.upper())}
+_YAML_NULL = {"", "~", "null", "Null", "NULL"}
+_PLAIN_BAD_START = set("-?:,[]{}#&*!|>'\"%@`0123456789+.")
+
+class _NotFlat(Exception):
+    pass
+
+def _after_quoted(rest: str) -> None:
+    if rest.strip() and not (rest[0] == " " and rest.lstrip(" ").startswith("#")):
+        raise _NotFlat
+
+def _flat_scalar(raw: str):
+    """Wert rechts von 'key:' (ohne führende Leerzeichen) → Python-Wert wie PyYAML."""
+    if not raw or raw[0] == "#":
+        return None
+    if raw[0] == '"':
+        end = raw.find('"', 1)
+        body = raw[1:end]
+        if end < 0 or "\\" in body:
+            raise _NotFlat
+        _after_quoted(raw[end + 1:])
+        return body
+    if raw[0] == "'":
+        out, pos = [], 1
+        while True:
+            end = raw.find("'", pos)
+            if end < 0:
+                raise _NotFlat   # mehrzeilig
+            out.append(raw[pos:end])
+            if raw[end + 1:end + 2] != "'":
+                break
+            out.append("'")
+            pos = end + 2
+        _after_quoted(raw[end + 1:])
+        return "".join(out)
+    cut = raw.find(" #")
+    value = (raw if cut < 0 else raw[:cut]).rstrip(" ")
+    if value[0] in _PLAIN_BAD_START or ": " in value or value.endswith(":") or value in ("<<", "="):
+        if _FLAT_INT_RE.match(value):
+            return int(value)
+        raise _NotFlat
+    if value in _YAML_NULL:
+        return None
+    return _YAML_BOOL.get(value, value)
+
+def load_flat_yaml(text: str) -> dict | None:
+    """Flache YAML-Datei → dict; None, wenn der Schnellpfad nicht sicher ist (→ PyYAML)."""
+    if "\t" in text or text.startswith("\ufeff") or _NON_PRINTABLE_RE.search(text):
+        return None
+    data: dict = {}
+    try:
+        for line in text.splitlines():
+            s = line.lstrip(" ")
+            if not s or s[0] == "#":
+                continue
+            m = _FLAT_LINE_RE.match(line)
+            if m is None or m.group(1) in _YAML_BOOL or m.group(1) in _YAML_NULL:
+                return None
+            data[m.group(1)] = _flat_scalar(m.group(2) or "")
+    except _NotFlat:
+        return None
+    return data
+
+@lru_cache(maxsize=None)
+def _pyyaml():
+    try:
+        import yaml  # type: ignore
+        return yaml
+    except ImportError:
+        return None
+
+# Prozess-Cache je Pfad, gültig solange size/mtime gleich bleiben (--batch, --watch, Hilfsskripte)
+_YAML_CACHE: dict[Path, tuple[tuple[int, int], dict, bool]] = {}
+# Platten-Cache für Dateien, die PyYAML brauchen (_quarto.yml …): .quarto/yaml-cache.json neben
+# der Datei → warme Läufe importieren PyYAML gar nicht. Nur JSON-treue Ergebnisse werden abgelegt.
+YAML_CACHE_VERSION = 1
 
-# ---------- YAML load/save (PyYAML wenn vorhanden; sonst einfacher Fallback) ----------
 def load_yaml(path: Path) -> dict:
-    if not path.exists():
+    """
+    YAML-Datei laden: flacher Schnellpfad, sonst Platten-Cache/PyYAML, sonst Zeilen-Fallback
+    (mit Warnung, weil er verschachtelte Werte flach liest). Ergebnis wird je (size, mtime)
+    gecacht; zurück kommt immer eine Kopie (Aufrufer dürfen das dict verändern).
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
         return {}
+    sig = (st.st_size, st.st_mtime_ns)
+    hit = _YAML_CACHE.get(path)
+    if hit is None or hit[0] != sig:
+        text = path.read_text(encoding="utf-8")
+        data = load_flat_yaml(text)
+        flat = data is not None
+        if data is None:
+            data = _load_yaml_cached(path, sig, text)
+        hit = _YAML_CACHE[path] = (sig, data, flat)
+    if hit[2]:
+        return dict(hit[1])
+    import copy
+    return copy.deepcopy(hit[1])
+
+def _load_yaml_cached(path: Path, sig: tuple[int, int], text: str) -> dict:
+    cache_path = path.parent / ".quarto" / "yaml-cache.json"
     try:
-        import yaml  # type: ignore
-        with open(path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
-    except Exception:
-        data = {}
-        for line in path.read_text(encoding="utf-8").splitlines():
-            s = line.strip()
-            if not s or s.startswith("#") or ":" not in s:
-                continue
-            key, val = s.split(":", 1)
-            key = key.strip()
-            val = val.strip().strip("'").strip('"')
-            data[key] = val
-        return data
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cache.get("version") != YAML_CACHE_VERSION:
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    files = cache.setdefault("files", {})
+    entry = files.get(path.name)
+    if entry and [entry.get("size"), entry.get("mtime_ns")] == list(sig):
+        return entry["data"]
+    data, exact = _load_yaml_slow(path, text)
+    try:
+        blob = json.dumps(data, ensure_ascii=False, sort_keys=True)
+        faithful = exact and json.loads(blob) == data   # Datumswerte, Nicht-String-Keys … → nicht cachen
+    except (TypeError, ValueError):
+        faithful = False
+    if faithful:
+        files[path.name] = {"size": sig[0], "mtime_ns": sig[1], "data": data}
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            write_text(cache_path, json.dumps({"version": YAML_CACHE_VERSION, "files": files},
+                                              ensure_ascii=False, indent=1, sort_keys=True) + "\n")
+        except OSError:
+            pass   # Cache ist optional (z. B. schreibgeschützter Checkout)
+    return data
+
+def _load_yaml_slow(path: Path, text: str) -> tuple[dict, bool]:
+    """(Daten, exakt?) – exakt = von PyYAML gelesen, nicht vom Zeilen-Fallback."""
+    yaml = _pyyaml()
+    if yaml is not None:
+        try:
+            return yaml.safe_load(text) or {}, True
+        except yaml.YAMLError as e:
+            reason = f"YAML-Fehler ({type(e).__name__})"
+    else:
+        reason = "PyYAML nicht installiert"
+    msg = f"[{path.name}] {reason} → vereinfachter Zeilen-Parser (verschachtelte Werte werden flach gelesen)"
+    _log(msg)
+    print(f"⚠️  {msg}", file=sys.stderr)
+    data = {}
+    for line in text.splitlines():
+        s = line.strip()
+        if not s or s.startswith("#") or ":" not in s:
+            continue
+        key, val = s.split(":", 1)
+        key = key.strip()
+        val = val.strip().strip("'").strip('"')
+        data[key] = val
+    return data, False
 
 def dump_yaml(path: Path, data: dict) -> None:
     try:
         import yaml  # type: ignore
-        with open(path, "w", encoding="utf-8") as f:
-            yaml.safe_dump(data, f, sort_keys=False, allow_unicode=True)
+        text = yaml.safe_dump(data, sort_keys=False, allow_unicode=True)
     except Exception:
         lines=[]
         for k,v in data.items():
@@ -85,7 +413,8 @@ def dump_yaml(path: Path, data: dict) -> None:
             if any(c in v for c in [":","#"]) or v == "" or " " in v:
                 v = f'"{v}"'
             lines.append(f"{k}: {v}")
-        path.write_text("\n".join(lines)+"\n", encoding="utf-8")
+        text = "\n".join(lines)+"\n"
+    write_text(path, text)
 
 # ---------- schema (key, label, default, required) ----------
 SCHEMA = [
@@ -117,6 +446,96 @@ SCHEMA = [
     ("contact_email","Kontakt E-Mail","", False),
 ]
 
+# ---------- Platzhalter-Engine: ein Regex für alle SCHEMA-Keys, ein Scan pro Datei ----------
+IMPRESSUM_KEYS = ["responsible_name","responsible_address","responsible_email","imprint_url",
+                  "uni_name","uni_url","institute_name","institute_url","chair_name","chair_url"]
+QMD_KEYS = ["site_title","org_name","course_code","contact_email"]
+
+PLACEHOLDER_RE = _LazyRe(
+    r"\{\{(" + "|".join(re.escape(k) for k,_,_,_ in SCHEMA) + r")\}\}"
+)
+
+def substitute_placeholders(text: str, values: dict[str, str]) -> tuple[str, dict[str, list[int]]]:
+    """
+    Ersetzt alle '{{key}}' mit key ∈ values in EINEM Durchlauf über text.
+    Keys aus SCHEMA, die nicht in values stehen, bleiben unverändert.
+    Rückgabe: (neuer Text, Zeilennummern der Treffer pro Key).
+    """
+    hits: dict[str, list[int]] = {}
+    if "{{" not in text:
+        return text, hits
+    index = None
+
+    def _sub(m: re.Match) -> str:
+        nonlocal index
+        key = m.group(1)
+        if key not in values:
+            return m.group(0)
+        if index is None:
+            index = LineIndex(text)
+        hits.setdefault(key, []).append(index.line(m.start()))
+        return values[key]
+
+    return PLACEHOLDER_RE.sub(_sub, text), hits
+
+# Große Dateien (generierte Tabellen, Daten-Blobs) blockweise statt am Stück: Spitzenspeicher
+# ~ STREAM_CHUNK Zeichen (+ Kopien je Block) statt mehrerer Kopien der ganzen Datei.
+STREAM_MIN_BYTES = 4 << 20   # darunter: substitute_placeholders im Speicher (schneller)
+STREAM_CHUNK     = 1 << 20   # Zeichen je Lesevorgang
+_PLACEHOLDER_MAX = 4 + max(len(k) for k,_,_,_ in SCHEMA)   # längster '{{key}}'
+
+def substitute_stream(path: Path, values: dict[str, str], st: dict,
+                      chunk: int = STREAM_CHUNK) -> tuple[dict[str, list[int]], bool]:
+    """
+    Wie read_text + substitute_placeholders + write_text, aber blockweise: liest path in Blöcken
+    (Universal-Newlines wie read_text), schreibt das Ergebnis laufend in eine Temp-Datei und
+    ersetzt path nur, wenn sich etwas geändert hat. Platzhalter über Blockgrenzen: Treffer werden
+    nur bis len(Puffer) - (_PLACEHOLDER_MAX - 1) angenommen, der Rest wandert in den nächsten Block.
+    Füllt st["bytes_read"/"bytes_written"]; Rückgabe: (Treffer je Key, geändert?).
+    """
+    hits: dict[str, list[int]] = {}
+    keep, nl = _PLACEHOLDER_MAX - 1, os.linesep
+    changed, line = False, 1
+    try:
+        with open(path, encoding="utf-8", newline=None) as src, _atomic_writer(path) as dst:
+            st["bytes_read"] = os.fstat(src.fileno()).st_size
+            buf, eof = "", False
+            while not eof:
+                block = src.read(chunk)
+                eof = not block
+                buf += block
+                limit = len(buf) if eof else len(buf) - keep
+                if limit <= 0:
+                    continue
+                out, pos = [], 0
+                while (m := PLACEHOLDER_RE.search(buf, pos)) is not None and m.start() < limit:
+                    out.append(buf[pos:m.start()])
+                    line += buf.count("\n", pos, m.start())
+                    key = m.group(1)
+                    if key in values:
+                        hits.setdefault(key, []).append(line)
+                        changed |= values[key] != m.group(0)
+                        out.append(values[key])
+                    else:
+                        out.append(m.group(0))
+                    pos = m.end()
+                end = max(limit, pos)
+                out.append(buf[pos:end])
+                line += buf.count("\n", pos, end)
+                piece = "".join(out)
+                if nl != "\n":
+                    piece = piece.replace("\n", nl)
+                st["bytes_written"] += dst.write(piece.encode("utf-8"))
+                buf = buf[end:]
+            if not changed:
+                raise _KeepOriginal
+    except _KeepOriginal:
+        st["bytes_written"] = 0
+    return hits, changed
+
+def _fmt_hits(hits: dict[str, list[int]]) -> str:
+    return ", ".join(f"{k}={len(lines)} {lines}" for k, lines in hits.items())
+
 def ask(label, default):
     try:
         v = input(f"{label} [{default}]: ").strip()
@@ -124,16 +543,15 @@ def ask(label, default):
     except EOFError:
         return default
 
-def prompt_missing(cfg: dict):
+def prompt_missing(cfg: dict, noninteractive: bool = True):
     changed=False
     for key,label,default,required in SCHEMA:
         cur = str(cfg.get(key,"") or "").strip()
         if cur:
             continue
-        if NONINTERACTIVE:
+        if noninteractive:
             if required:
-                print(f"❌ Missing required value: {key}")
-                sys.exit(1)
+                raise ConfigureError(f"Missing required value: {key}")
             else:
                 continue
         cfg[key] = ask(label, default)
@@ -141,11 +559,247 @@ def prompt_missing(cfg: dict):
     return cfg, changed
 
 # ---------- helpers: Dateizugriffe ----------
+def read_text_sized(path: Path) -> tuple[str, int]:
+    """Wie Path.read_text (inkl. Universal-Newlines), liefert zusätzlich die gelesenen Bytes."""
+    data = path.read_bytes()
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text, len(data)
+
 def read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
+    return read_text_sized(path)[0]
+
+def write_text(path: Path, text: str) -> int:
+    """
+    Wie Path.write_text (Newlines → os.linesep), aber nur wenn sich die Bytes ändern, und dann
+    atomar. Unveränderte Dateien behalten ihre mtime (Quarto-Freeze/Render-Caches, CI-Caches).
+    Rückgabe: geschriebene Bytes (0 = unverändert, übersprungen).
+    """
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return write_bytes(path, text.encode("utf-8"))
+
+def write_bytes(path: Path, data: bytes) -> int:
+    """Bytes nur bei Änderung schreiben (atomar); Rückgabe wie write_text."""
+    if _same_bytes(path, data):
+        return 0
+    _replace_atomic(path, data)
+    return len(data)
+
+def _same_bytes(path: Path, data: bytes) -> bool:
+    """Größe per stat vorab prüfen; gelesen wird nur bei gleicher Größe."""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except FileNotFoundError:
+        return False
+
+@lru_cache(maxsize=None)
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+def _replace_atomic(path: Path, data: bytes) -> None:
+    """Temp-Datei im Zielordner + os.replace → Leser sehen nie eine halb geschriebene Datei."""
+    with _atomic_writer(path) as f:
+        f.write(data)
+
+class _KeepOriginal(Exception):
+    """In _atomic_writer ausgelöst: Temp-Datei verwerfen, Ziel bleibt unangetastet (mtime)."""
+
+@contextmanager
+def _atomic_writer(path: Path):
+    """
+    Binäre Temp-Datei neben path; nach fehlerfreiem Block per os.replace an ihre Stelle
+    (Rechte des Ziels bleiben). Bei Ausnahme (auch _KeepOriginal) wird sie gelöscht.
+    """
+    if path.is_symlink():
+        path = Path(os.path.realpath(path))   # Ziel ersetzen, nicht den Link
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_umask()
+    # wie tempfile.mkstemp (exklusiv angelegt, 0600), ohne tempfile zu importieren
+    tmp = str(path.parent / f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o600)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+# ---------- Quell-Discovery: *.qmd finden, Ignore-Regeln + project.render beachten ----------
+IGNORE_FILES    = [".quartoignore", ".templateignore"]
+PROJECT_CONFIGS = ["_quarto.yml", "_quarto-ci.yml"]
+# Immer übersprungen (zusätzlich zu allen Verzeichnissen mit führendem '.')
+PRUNE_DIRS = {"_site", "_extensions", "_freeze", "node_modules", "renv", "venv"}
+
+def _read_ignore_patterns(path: Path) -> list[str]:
+    """
+    gitignore-artige Muster (Teilmenge): '#'-Kommentare (auch inline), 'dir/' = nur Verzeichnisse,
+    Muster ohne '/' gelten in jeder Tiefe. Negationen ('!') werden ignoriert.
+    """
+    if not path.exists():
+        return []
+    pats = []
+    for line in read_text(path).splitlines():
+        s = re.split(r'(?:^|\s)#', line, maxsplit=1)[0].strip()
+        if s and not s.startswith("!"):
+            pats.append(s)
+    return pats
+
+def _norm_rel(p: str) -> str:
+    p = p.strip()
+    while p.startswith("./"):
+        p = p[2:]
+    return p.rstrip("/")
+
+def _match_any(rel: str, is_dir: bool, patterns: list[str]) -> bool:
+    name = rel.rsplit("/", 1)[-1]
+    for pat in patterns:
+        if pat.endswith("/") and not is_dir:
+            continue
+        pat = _norm_rel(pat)
+        if "/" in pat:
+            if fnmatchcase(rel, pat) or rel.startswith(pat + "/"):
+                return True
+        elif fnmatchcase(name, pat):
+            return True
+    return False
+
+def _as_list(x) -> list[str]:
+    if not x:
+        return []
+    return [str(x)] if isinstance(x, str) else [str(i) for i in x]
+
+def discovery_rules(base: Path) -> dict:
+    """
+    Sammelt Regeln aus .quartoignore/.templateignore und project.* in _quarto.yml/_quarto-ci.yml:
+      - output-dir              → Verzeichnis wird übersprungen
+      - resources: 'dir/**'     → Verzeichnis wird übersprungen (wird nur kopiert)
+      - render: [...]           → nur passende Dateien ('!x' schließt aus); '.' bzw. fehlend = alles
+    Profile werden vereinigt (Obermenge ist sicher: zu viel ersetzen schadet nicht).
+    """
+    ignore: list[str] = []
+    for name in IGNORE_FILES:
+        ignore += _read_ignore_patterns(base / name)
+
+    prune, include, exclude = set(), [], []
+    render_all = False
+    for name in PROJECT_CONFIGS:
+        path = base / name
+        if not path.exists():
+            continue
+        proj = load_yaml(path).get("project") or {}
+        if not isinstance(proj, dict):
+            proj = {}
+        if proj.get("output-dir"):
+            prune.add(_norm_rel(str(proj["output-dir"])))
+        for r in _as_list(proj.get("resources")):
+            r = _norm_rel(r)
+            if r.endswith("/**") and not any(c in r[:-3] for c in "*?["):
+                prune.add(r[:-3])
+        entries = _as_list(proj.get("render"))
+        if not entries:
+            render_all = True
+        for e in entries:
+            if e.startswith("!"):
+                exclude.append(_norm_rel(e[1:]))
+            elif _norm_rel(e) in ("", ".", "*", "**"):
+                render_all = True
+            else:
+                include.append(_norm_rel(e))
+
+    return {"ignore": ignore, "prune": sorted(prune),
+            "include": None if render_all else include, "exclude": exclude}
 
-def write_text(path: Path, text: str) -> None:
-    path.write_text(text, encoding="utf-8")
+def _walk_qmd(base: Path, rules: dict) -> tuple[list[str], dict[str, int]]:
+    """
+    Iterativer os.scandir-Walk mit frühem Prunen ganzer Verzeichnisse.
+    Rückgabe: (relative *.qmd-Pfade sortiert, {besuchtes Verzeichnis: mtime_ns}).
+    """
+    prune = set(rules["prune"])
+    files: list[str] = []
+    dirs: dict[str, int] = {}
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        full = os.path.join(base, rel_dir) if rel_dir else str(base)
+        try:
+            dirs[rel_dir or "."] = os.stat(full).st_mtime_ns
+            with os.scandir(full) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for e in entries:
+            rel = f"{rel_dir}/{e.name}" if rel_dir else e.name
+            if e.is_dir(follow_symlinks=False):
+                if (e.name.startswith(".") or e.name in PRUNE_DIRS or rel in prune
+                        or _match_any(rel, True, rules["ignore"])
+                        or _match_any(rel, True, rules["exclude"])):
+                    continue
+                stack.append(rel)
+            elif e.name.endswith(".qmd") and e.is_file():
+                if _match_any(rel, False, rules["ignore"]) or _match_any(rel, False, rules["exclude"]):
+                    continue
+                if rules["include"] is not None and not _match_any(rel, False, rules["include"]):
+                    continue
+                files.append(rel)
+    files.sort()
+    return files, dirs
+
+def _discovery_sig(base: Path) -> list:
+    """size/mtime der Regel-Dateien → billiger Check, ob die Regeln neu gelesen werden müssen."""
+    sig = []
+    for name in IGNORE_FILES + PROJECT_CONFIGS:
+        try:
+            st = os.stat(base / name)
+            sig.append([name, st.st_size, st.st_mtime_ns])
+        except OSError:
+            sig.append([name, None, None])
+    return sig
+
+def _dirs_unchanged(base: Path, dirs: dict[str, int]) -> bool:
+    try:
+        return all(os.stat(base / rel).st_mtime_ns == mt for rel, mt in dirs.items())
+    except OSError:
+        return False
+
+def discover_qmd(base: Path, cache: dict | None = None) -> tuple[list[Path], dict]:
+    """
+    Liefert alle zu bearbeitenden *.qmd unter base (sortiert) und einen Cache-Eintrag.
+    Mit cache: unveränderte Regel-Dateien + unveränderte Verzeichnis-mtimes → kein Walk nötig
+    (neue/gelöschte Dateien ändern immer die mtime ihres Verzeichnisses).
+    """
+    sig = _discovery_sig(base)
+    if cache and cache.get("sig") == sig and _dirs_unchanged(base, cache.get("dirs", {})):
+        return [base / r for r in cache["files"]], cache
+    rules = discovery_rules(base)
+    files, dirs = _walk_qmd(base, rules)
+    return [base / r for r in files], {"sig": sig, "rules": rules, "dirs": dirs, "files": files}
+
+def refresh_discovery_cache(base: Path, cache: dict) -> dict | None:
+    """
+    Nach dem Lauf: Signatur + Verzeichnis-mtimes neu erfassen (configure.py schreibt selbst
+    z. B. _quarto.yml). Haben sich dabei die Regeln geändert, wird der Cache verworfen.
+    """
+    sig = _discovery_sig(base)
+    if sig != cache.get("sig") and discovery_rules(base) != cache.get("rules"):
+        return None
+    try:
+        dirs = {rel: os.stat(base / rel).st_mtime_ns for rel in cache.get("dirs", {})}
+    except OSError:
+        return None
+    return {**cache, "sig": sig, "dirs": dirs}
 
 # ---------- helpers: Replacements mit Logging ----------
 def replace_entire_line(text: str, key: str, value: str, file_path: Path | None = None) -> str:
@@ -156,42 +810,265 @@ def replace_entire_line(text: str, key: str, value: str, file_path: Path | None
                          flags=re.M)
     matches = list(pattern.finditer(text))
     if matches:
-        lines = [_line_no_for_pos(text, m.start()) for m in matches]
+        index = LineIndex(text)
+        lines = [index.line(m.start()) for m in matches]
         _log(f"[{file_path.name if file_path else '?'}] replace_line key='{key}' → '{value}' (count={len(lines)}, lines={lines})")
         text = pattern.sub(rf'\1{value}', text)
     else:
         _log(f"[{file_path.name if file_path else '?'}] replace_line key='{key}' → keine Fundstelle")
     return text
 
-def simple_replace(text: str, pairs: dict[str, str], file_path: Path | None = None) -> str:
+def _find_all(text: str, needle: str) -> list[int]:
+    out, pos = [], text.find(needle)
+    while pos != -1:
+        out.append(pos)
+        pos = text.find(needle, pos + len(needle))
+    return out
+
+def simple_replace(text: str, pairs: dict[str, str], file_path: Path | None = None,
+                   stats: dict | None = None) -> str:
     for old, new in pairs.items():
-        cnt = text.count(old)
-        if cnt:
-            _log(f"[{file_path.name if file_path else '?'}] simple_replace '{old}' → '{new}' (count={cnt})")
+        found = _find_all(text, old)
+        if stats is not None:
+            stats["replacements"] += len(found)
+        if found:
+            index = LineIndex(text)
+            lines = [index.line(pos) for pos in found]
+            _log(f"[{file_path.name if file_path else '?'}] simple_replace '{old}' → '{new}' (count={len(lines)}, lines={lines})")
             text = text.replace(old, new)
         else:
             _log(f"[{file_path.name if file_path else '?'}] simple_replace '{old}' → keine Fundstelle")
     return text
 
+# ---------- YAML-Editor: _quarto.yml einmal parsen, Pfad-Edits, einmal serialisieren ----------
+_KEY_RE = _LazyRe(r'([A-Za-z0-9_][\w.\-]*)[ \t]*:(?:[ \t]+|$)')
+_COMMENT_RE = _LazyRe(r'(?:^|[ \t]+)#')
+
+def _split_comment(raw: str) -> tuple[str, str]:
+    """'wert   # kommentar' → ('wert', '   # kommentar'); '#' in gequoteten Werten zählt nicht."""
+    start = 0
+    if raw[:1] in ("'", '"'):
+        q, i = raw[0], 1
+        while i < len(raw):
+            if q == '"' and raw[i] == "\\":
+                i += 2
+                continue
+            if raw[i] == q:
+                if q == "'" and raw[i+1:i+2] == "'":
+                    i += 2
+                    continue
+                break
+            i += 1
+        start = i + 1
+    m = _COMMENT_RE.search(raw, start)
+    if m:
+        return raw[:m.start()], raw[m.start():]
+    val = raw.rstrip()
+    return val, raw[len(val):]
+
+class _Node:
+    __slots__ = ("line", "col", "vcol", "end", "last")
+
+    def __init__(self, line: int, col: int, vcol: int | None):
+        self.line = line    # Zeilenindex des Keys (bzw. des '-' bei Listeneinträgen)
+        self.col  = col     # Einrückung des Keys
+        self.vcol = vcol    # Spalte, an der der Wert beginnt (None bei Listeneinträgen)
+        self.end  = line + 1  # erste Zeile NACH dem Block (inkl. Kommentare/Leerzeilen)
+        self.last = line    # letzte inhaltliche Zeile des Blocks
+
+class YamlDoc:
+    """
+    Kommentarerhaltender Editor für Block-YAML wie _quarto.yml.
+    Der Text wird EINMAL in Zeilen zerlegt und indiziert; Knoten sind über Pfade adressierbar,
+    z. B. ("website","navbar","right",0,"href"). Edits verschieben keine Zeilenindizes
+    (Löschen = None, Einfügen = Liste hinter einer Zeile), dump() serialisiert EINMAL.
+    Unveränderte Zeilen bleiben byte-gleich. Bewusst keine vollständige YAML-Implementierung:
+    Flow-Collections und Block-Scalars ('|', '>') werden als Werte behandelt.
+    """
+
+    def __init__(self, text: str):
+        self.lines: list[str | None] = text.split("\n")
+        self.after: dict[int, list[str]] = {}
+        self.nodes: dict[tuple, _Node] = {}
+        self.text = text
+        self._parse()
+
+    def _parse(self) -> None:
+        stack: list[tuple[int, bool, _Node]] = []   # (Einrückung, offener Block?, Knoten)
+        paths: list[tuple] = []
+        counters: dict[tuple, int] = {}
+        scalar_col = None
+        last = -1
+
+        def close(i: int) -> None:
+            _, _, node = stack.pop()
+            paths.pop()
+            node.end, node.last = i, max(node.line, last)
+
+        for i, line in enumerate(self.lines):
+            s = line.lstrip(" ")
+            if not s or s.startswith("#"):
+                continue
+            ind = len(line) - len(s)
+            if scalar_col is not None:
+                if ind > scalar_col:
+                    last = i
+                    continue
+                scalar_col = None
+            is_item = s == "-" or s.startswith("- ")
+            while stack and (stack[-1][0] > ind or (stack[-1][0] == ind and not (is_item and stack[-1][1]))):
+                close(i)
+            parent = paths[-1] if paths else ()
+            col = ind
+            if is_item:
+                idx = counters.get(parent, 0)
+                counters[parent] = idx + 1
+                parent = parent + (idx,)
+                node = self.nodes.setdefault(parent, _Node(i, ind, None))
+                stack.append((ind, False, node))
+                paths.append(parent)
+                rest = s[1:].lstrip(" ")
+                col = ind + len(s) - len(rest)
+                s = rest
+            last = i
+            m = _KEY_RE.match(s)
+            if not m:
+                continue
+            path = parent + (m.group(1),)
+            vcol = col + m.end()
+            val = _split_comment(line[vcol:])[0]
+            node = self.nodes.setdefault(path, _Node(i, col, vcol))
+            stack.append((col, val == "", node))
+            paths.append(path)
+            if val[:1] in ("|", ">"):
+                scalar_col = col
+        while stack:
+            close(len(self.lines))
+
+    def node(self, path: tuple) -> _Node | None:
+        return self.nodes.get(path)
+
+    def get(self, path: tuple) -> str | None:
+        n = self.nodes.get(path)
+        if n is None or n.vcol is None:
+            return None
+        return _split_comment(self.lines[n.line][n.vcol:])[0]
+
+    def set(self, path: tuple, value: str) -> int | None:
+        """Wert setzen (Inline-Kommentar bleibt); Rückgabe: 1-basierte Zeilennummer oder None."""
+        n = self.nodes.get(path)
+        if n is None or n.vcol is None:
+            return None
+        line = self.lines[n.line]
+        head = line[:n.vcol]
+        if not head[-1:].isspace():
+            head += " "
+        self.lines[n.line] = head + value + _split_comment(line[n.vcol:])[1]
+        return n.line + 1
+
+    def items(self, path: tuple) -> list[tuple]:
+        """Pfade der Listeneinträge unter path, in Dokument-Reihenfolge."""
+        out, i = [], 0
+        while path + (i,) in self.nodes:
+            out.append(path + (i,))
+            i += 1
+        return out
+
+    def child_indent(self, path: tuple) -> int | None:
+        cols = [n.col for p, n in self.nodes.items() if len(p) == len(path) + 1 and p[:-1] == path]
+        return min(cols) if cols else None
+
+    def remove_line(self, i: int) -> None:
+        self.lines[i] = None
+
+    def insert_after(self, i: int, line: str) -> None:
+        self.after.setdefault(i, []).append(line)
+
+    def subn(self, path: tuple, pattern: re.Pattern, repl) -> list[int]:
+        """
+        pattern.sub auf dem Textblock von path (Key-Zeile bis Blockende).
+        Rückgabe: 1-basierte Zeilennummern (Original-Datei) aller Treffer.
+        """
+        n = self.nodes.get(path)
+        if n is None:
+            return []
+        idx = [i for i in range(n.line, n.end) if self.lines[i] is not None]
+        text = "\n".join(self.lines[i] for i in idx)
+        index = LineIndex(text)
+        lines = [idx[index.line(m.start()) - 1] + 1 for m in pattern.finditer(text)]
+        if lines:
+            block = pattern.sub(repl, text)
+            new = block.split("\n")
+            if len(new) != len(idx):        # Zeilenzahl geändert → Block als Ganzes ablegen
+                new = [block] + [None] * (len(idx) - 1)
+            for i, line in zip(idx, new):
+                self.lines[i] = line
+        return lines
+
+    def dump(self) -> str:
+        out: list[str] = []
+        for i, line in enumerate(self.lines):
+            if line is not None:
+                out.append(line)
+            out.extend(self.after.get(i, ()))
+        return "\n".join(out)
+
+    def changed_lines(self, new: str | None = None) -> int:
+        """
+        Zeilen, die sich gegenüber dem Original tatsächlich unterscheiden (new = dump()). Setzen auf
+        den gleichen Wert oder Entfernen + gleiches Wiedereinfügen zählt nicht.
+        """
+        new = self.dump() if new is None else new
+        if new == self.text:
+            return 0
+        import difflib
+        ops = difflib.SequenceMatcher(None, self.text.split("\n"), new.split("\n"), autojunk=False).get_opcodes()
+        return sum(max(i2 - i1, j2 - j1) for tag, i1, i2, j1, j2 in ops if tag != "equal")
+
+def _dotted(path: tuple) -> str:
+    return ".".join(str(p) for p in path)
+
+def set_yaml_value(doc: YamlDoc, path: tuple, value: str, file_path: Path | None = None) -> None:
+    fn = file_path.name if file_path else "?"
+    line = doc.set(path, value)
+    if line:
+        _log(f"[{fn}] set {_dotted(path)} → '{value}' (line {line})")
+    else:
+        _log(f"[{fn}] set {_dotted(path)} → keine Fundstelle")
+
 # ---------- Theme-Stack: light/dark ----------
-def set_light_brand_line(text: str, use_brand: bool) -> str:
+THEME_PATH = ("format", "html", "theme")
+
+def set_light_brand_line(doc: YamlDoc, use_brand: bool, file_path: Path | None = None) -> None:
     """
     Branding AN:  'light: lumen' → 'light: [lumen, css/custom.scss]'
     Branding AUS: 'light: [lumen, css/custom.scss]' → 'light: lumen'
     """
+    fn = file_path.name if file_path else "?"
+    path = THEME_PATH + ("light",)
+    cur = doc.get(path)
+    if cur is None:
+        _log(f"[{fn}] {_dotted(path)} nicht gefunden → übersprungen")
+        return
     if use_brand:
-        pat = re.compile(r'(^\s*light:\s*(?:\[\s*)?lumen(?:\s*\])?\s*$)', flags=re.M)
-        if "custom.scss" in text:
-            return text
-        return pat.sub('      light: [lumen, css/custom.scss]', text, count=1)
-    # Branding AUS → zurück auf vanilla
-    return re.sub(r'^\s*light:\s*\[.*?custom\.scss.*?\]\s*$', '      light: lumen', text, flags=re.M)
+        if "custom.scss" in cur or not re.fullmatch(r'\[?\s*lumen\s*\]?', cur):
+            return
+        new = '[lumen, css/custom.scss]'
+    else:
+        # Branding AUS → zurück auf vanilla
+        if not re.fullmatch(r'\[.*?custom\.scss.*?\]', cur):
+            return
+        new = 'lumen'
+    line = doc.set(path, new)
+    _log(f"[{fn}] set {_dotted(path)} → '{new}' (line {line})")
 
-def set_dark_line(text: str, use_brand: bool, dark_on: bool) -> str:
+def set_dark_line(doc: YamlDoc, use_brand: bool, dark_on: bool, file_path: Path | None = None) -> None:
     """
-    Stellt sicher, dass im Theme-Block genau EINE 'dark:'-Zeile steht (Duplikate werden entfernt)
-    und sie direkt unter der 'light:'-Zeile sitzt. Optional kommentiert, wenn dark_off.
+    Stellt sicher, dass im Theme-Block genau EINE 'dark:'-Zeile steht (Duplikate, auskommentierte
+    Varianten und der Platzhalter __DARK_THEME_LINE__ werden entfernt) und sie direkt unter der
+    'light:'-Zeile sitzt. Optional kommentiert, wenn dark_off.
     """
+    fn = file_path.name if file_path else "?"
     # Zielwert bestimmen
     if dark_on and use_brand:
         value = '[lumen, css/theme-dark.scss, css/custom.scss]'
@@ -203,44 +1080,36 @@ def set_dark_line(text: str, use_brand: bool, dark_on: bool) -> str:
         value = '[lumen, css/theme-dark.scss, css/custom.scss]' if use_brand else 'lumen'
         commented = True
 
-    # Platzhalter __DARK_THEME_LINE__ (falls existiert) direkt einsetzen,
-    # danach zur Sicherheit alle weiteren dark:-Zeilen entfernen.
-    if "__DARK_THEME_LINE__" in text or "# __DARK_THEME_LINE__" in text:
-        mlight = re.search(r'^(\s*)light:\s*.*$', text, flags=re.M)
-        indent = (mlight.group(1) if mlight else "      ")
-        new_line = f"{indent}{'#' if commented else ''}dark:  {value}"
-        text = text.replace("__DARK_THEME_LINE__", new_line).replace("# __DARK_THEME_LINE__", new_line)
-        text = re.sub(r'^\s*#?\s*dark:\s*(?:\[.*?\]|[^\n]*)\s*$', '', text, flags=re.M)
-        return text
-
-    # 1) ALLE vorhandenen dark:-Zeilen (auch kommentierte) entfernen
-    text = re.sub(r'^\s*#?\s*dark:\s*(?:\[.*?\]|[^\n]*)\s*$', '', text, flags=re.M)
-
-    # 2) Einrückung an der light:-Zeile ermitteln
-    m = re.search(r'^(\s*)light:\s*.*$', text, flags=re.M)
-    indent = m.group(1) if m else "      "
-    new_line = f"{indent}{'#' if commented else ''}dark:  {value}"
-
-    # 3) Neue dark:-Zeile direkt UNTER light: einfügen
-    if m:
-        insert_pos = m.end(0)
-        return text[:insert_pos] + "\n" + new_line + text[insert_pos:]
+    theme, light = doc.node(THEME_PATH), doc.node(THEME_PATH + ("light",))
+    if theme is None or light is None:
+        _log(f"[{fn}] {_dotted(THEME_PATH)}.light nicht gefunden → dark: übersprungen")
+        return
 
-    # Fallback: wenn keine light:-Zeile existiert → ans Ende
-    return text.rstrip() + "\n" + new_line + "\n"
+    # 1) ALLE vorhandenen dark:-Zeilen (auch kommentierte) + Platzhalter im Theme-Block entfernen
+    dark_re = re.compile(r'[ \t]*#?[ \t]*(?:dark:|__DARK_THEME_LINE__)')
+    for i in range(theme.line + 1, theme.end):
+        if doc.lines[i] is not None and dark_re.match(doc.lines[i]):
+            doc.remove_line(i)
+
+    # 2) Neue dark:-Zeile direkt UNTER light: (gleiche Einrückung)
+    new_line = f"{' ' * light.col}{'#' if commented else ''}dark:  {value}"
+    doc.insert_after(light.last, new_line)
+    _log(f"[{fn}] set {_dotted(THEME_PATH)}.dark → '{new_line.strip()}' (nach line {light.last + 1})")
 
 # ---------- Eigene Domain in link-external-filter whitelisten ----------
+HTML_PATH = ("format", "html")
+
 def _escape_for_regex_path(host_plus_path: str) -> str:
     # "/" muss in Python-Regex nicht escaped werden; re.escape reicht.
     return re.escape(host_plus_path)
 
-def set_link_external_filter_line(text: str, site_url: str, file_path: Path | None = None) -> str:
+def set_link_external_filter_line(doc: YamlDoc, site_url: str, file_path: Path | None = None) -> None:
     r"""
-    Trägt die eigene site_url in 'link-external-filter' ein, damit Links zur eigenen
+    Trägt die eigene site_url in format.html.link-external-filter ein, damit Links zur eigenen
     Domain NICHT als extern gelten. Idempotent:
       - wenn Host/Pfad schon enthalten → keine Änderung
-      - wenn Zeile existiert → Host/Pfad in bestehende Gruppe einfügen oder Wert ersetzen
-      - wenn Zeile fehlt → sinnvoll einfügen
+      - wenn Key existiert → Host/Pfad in bestehende Gruppe einfügen oder Wert ersetzen
+      - wenn Key fehlt → nach md-extensions bzw. als erster Eintrag unter format.html einfügen
 
     Beispiel-Zielwert:
       link-external-filter: '^(?:http:|https:)//(user\.github\.io/repo|www\.quarto\.org/custom)'
@@ -248,12 +1117,13 @@ def set_link_external_filter_line(text: str, site_url: str, file_path: Path | No
     fn = file_path.name if file_path else "?"
     if not (site_url or "").strip():
         _log(f"[{fn}] link-external-filter: site_url leer → übersprungen")
-        return text
+        return
 
+    from urllib.parse import urlparse
     u = urlparse(site_url.strip())
     if not u.scheme or not u.netloc:
         _log(f"[{fn}] link-external-filter: ungültige site_url → '{site_url}'")
-        return text
+        return
 
     # host + optionaler Pfad (für GH Pages z. B. 'user.github.io/repo')
     host_path = u.netloc + (("/" + u.path.strip("/")) if u.path and u.path.strip("/") else "")
@@ -262,14 +1132,13 @@ def set_link_external_filter_line(text: str, site_url: str, file_path: Path | No
     # Zielwert (inkl. Quarto-Ausnahme)
     wanted_val = rf"'^(?:http:|https:)//({site_piece}|www\.quarto\.org/custom)'"
 
-    line_re = re.compile(r'^\s*link-external-filter:\s*.*$', re.M)
-    m = line_re.search(text)
+    path = HTML_PATH + ("link-external-filter",)
+    current = doc.get(path)
 
-    if m:
-        current = m.group(0)
+    if current is not None:
         if site_piece in current:
             _log(f"[{fn}] link-external-filter: eigener Host bereits enthalten")
-            return text
+            return
 
         # Versuche, site_piece in bestehende Gruppe nach '//' einzufügen
         idx_slashes = current.find("//")
@@ -277,149 +1146,126 @@ def set_link_external_filter_line(text: str, site_url: str, file_path: Path | No
             idx_open = current.find("(", idx_slashes)
             idx_close = current.find(")", idx_open + 1) if idx_open != -1 else -1
             if idx_open != -1 and idx_close != -1:
-                new_line = current[:idx_close] + f"|{site_piece}" + current[idx_close:]
-                text = text[:m.start()] + new_line + text[m.end():]
-                _log(f"[{fn}] link-external-filter: Host ergänzt → {site_piece}")
-                return text
-
-        # Fallback: ganze Zeile auf wanted_val setzen
-        new_line = re.sub(r'(:\s*).*$',
-                          rf'\1{wanted_val}',
-                          current)
-        text = text[:m.start()] + new_line + text[m.end():]
-        _log(f"[{fn}] link-external-filter: Wert ersetzt → {wanted_val}")
-        return text
-
-    # Zeile existiert nicht → einfügen
+                line = doc.set(path, current[:idx_close] + f"|{site_piece}" + current[idx_close:])
+                _log(f"[{fn}] link-external-filter: Host ergänzt → {site_piece} (line {line})")
+                return
+
+        # Fallback: Wert auf wanted_val setzen
+        line = doc.set(path, wanted_val)
+        _log(f"[{fn}] link-external-filter: Wert ersetzt → {wanted_val} (line {line})")
+        return
+
+    # Key existiert nicht → einfügen
     # 1) bevorzugt direkt nach 'md-extensions:' (gleiche Einrückung)
-    md_match = re.search(r'^(\s*)md-extensions:\s*.*$', text, re.M)
-    if md_match:
-        indent = md_match.group(1)
-        insert = f"\n{indent}link-external-filter: {wanted_val}"
-        pos = md_match.end(0)
-        text = text[:pos] + insert + text[pos:]
+    md = doc.node(HTML_PATH + ("md-extensions",))
+    if md is not None:
+        doc.insert_after(md.last, f"{' ' * md.col}link-external-filter: {wanted_val}")
         _log(f"[{fn}] link-external-filter eingefügt nach md-extensions → {wanted_val}")
-        return text
-
-    # 2) alternativ unter 'html:' mit +2 Spaces
-    html_match = re.search(r'^(\s*)html:\s*$', text, re.M)
-    if html_match:
-        indent = html_match.group(1) + "  "
-        insert = f"\n{indent}link-external-filter: {wanted_val}"
-        pos = html_match.end(0)
-        text = text[:pos] + insert + text[pos:]
+        return
+
+    # 2) alternativ als erster Eintrag unter format.html
+    html = doc.node(HTML_PATH)
+    if html is not None and doc.get(HTML_PATH) == "":
+        indent = doc.child_indent(HTML_PATH)
+        indent = html.col + 2 if indent is None else indent
+        doc.insert_after(html.line, f"{' ' * indent}link-external-filter: {wanted_val}")
         _log(f"[{fn}] link-external-filter eingefügt unter html → {wanted_val}")
-        return text
+        return
 
-    # 3) Fallback: ans Ende (typische Einrückung)
-    text = text.rstrip() + f"\n      link-external-filter: {wanted_val}\n"
-    _log(f"[{fn}] link-external-filter angehängt → {wanted_val}")
-    return text
+    _log(f"[{fn}] link-external-filter: format.html nicht gefunden → übersprungen")
 
 # ---------- Navbar-right gezielt aktualisieren (keine leeren Werte) ----------
+NAV_RIGHT_PATH = ("website", "navbar", "right")
+
 def _yaml_quote(s: str) -> str:
     s = "" if s is None else str(s)
     return '"' + s.replace('"', '\\"') + '"'
 
-def update_nav_right(text: str, portal_text: str | None, portal_url: str | None, file_path: Path | None = None) -> str:
+def update_nav_right(doc: YamlDoc, portal_text: str | None, portal_url: str | None, file_path: Path | None = None) -> None:
     """
-    Ersetzt NUR im navbar.right den ersten Eintrag 'text:' und 'href:'.
+    Ersetzt NUR in website.navbar.right den ersten Eintrag mit 'text:' bzw. 'href:'.
     - Nur ersetzen, wenn portal_text/portal_url nicht leer sind.
     - Idempotent: max. 1x pro Feld.
     - Lässt left:/weitere Einträge unangetastet.
     """
     fn = file_path.name if file_path else "?"
-    m_right = re.search(r'^(\s*)right:\s*\n((?:^\1\s{2,}.*\n)*)', text, flags=re.M)
-    if not m_right:
+    items = doc.items(NAV_RIGHT_PATH)
+    if not items:
         _log(f"[{fn}] navbar.right nicht gefunden → übersprungen")
-        return text
-
-    indent = m_right.group(1)
-    body   = m_right.group(2) or ""
+        return
 
-    def _replace_field(body: str, field: str, value: str) -> tuple[str, bool]:
-        pat = re.compile(rf'^(\s*{re.escape(field)}:\s*).*$',
-                         flags=re.M)
-        m = pat.search(body)
-        if not m:
-            return body, False
-        before = body[:m.start()]
-        after  = body[m.end():]
-        new_line = m.group(1) + value
-        return before + new_line + after, True
-
-    changed_any = False
-
-    if portal_text and portal_text.strip():
-        q = _yaml_quote(portal_text.strip())
-        body2, changed = _replace_field(body, 'text', q)
-        if changed:
-            _log(f"[{fn}] navbar.right → text: {q}")
-            body = body2
-            changed_any = True
-        else:
-            _log(f"[{fn}] navbar.right → text: Feld nicht gefunden")
-
-    if portal_url and portal_url.strip():
-        q = _yaml_quote(portal_url.strip())
-        body2, changed = _replace_field(body, 'href', q)
-        if changed:
-            _log(f"[{fn}] navbar.right → href: {q}")
-            body = body2
-            changed_any = True
+    for field, value in (("text", portal_text), ("href", portal_url)):
+        if not (value and value.strip()):
+            continue
+        q = _yaml_quote(value.strip())
+        target = next((it + (field,) for it in items if doc.node(it + (field,))), None)
+        line = doc.set(target, q) if target is not None else None
+        if line:
+            _log(f"[{fn}] navbar.right → {field}: {q} (line {line})")
         else:
-            _log(f"[{fn}] navbar.right → href: Feld nicht gefunden")
-
-    if not changed_any:
-        return text
-
-    return text[:m_right.start(2)] + body + text[m_right.end(2):]
+            _log(f"[{fn}] navbar.right → {field}: Feld nicht gefunden")
 
 # ---------- updates ----------
+FOOTER_PATH = ("website", "page-footer")
+IMPRESSUM_LINK_RE = _LazyRe(r'(<a[^>]*class="impressum-link"[^>]*href=")[^"]*(")', re.I)
+
 def update_quarto_yaml(base: Path, v: dict):
+    """
+    _quarto.yml EINMAL parsen, alle Änderungen als Pfad-Operationen anwenden, EINMAL schreiben.
+    """
     yml_path = base / "_quarto.yml"
     if not yml_path.exists():
         return
-    yml = read_text(yml_path)
+    with file_stats(yml_path) as st:
+        text, st["bytes_read"] = read_text_sized(yml_path)
+        doc = YamlDoc(text)
+        _patch_quarto_yaml(doc, yml_path, v)
+        new = doc.dump()
+        st["replacements"] = doc.changed_lines(new)
+        st["bytes_written"] = write_text(yml_path, new)
+    emit_file(st)
+    if not st["bytes_written"]:
+        _log(f"[{yml_path.name}] unverändert → nicht geschrieben")
+
+def _patch_quarto_yaml(doc: YamlDoc, yml_path: Path, v: dict) -> None:
 
     USE_BRAND = bool((v.get("brand_hex") or "").strip())
     DARK_ON   = str(v.get("dark_theme","yes")).lower() == "yes"
 
     # 1) Light-Theme je nach Branding
-    yml = set_light_brand_line(yml, USE_BRAND)
+    set_light_brand_line(doc, USE_BRAND, yml_path)
 
     # 2) Dark-Theme je nach Branding + Schalter (duplikatsicher)
-    yml = set_dark_line(yml, USE_BRAND, DARK_ON)
+    set_dark_line(doc, USE_BRAND, DARK_ON, yml_path)
 
-    # 3) Idempotente Zeilenersetzungen + Logging (nur wirklich globale Felder)
-    yml = replace_entire_line(yml, "title", f'"{v["site_title"]}"', yml_path)
-    yml = replace_entire_line(yml, "site-url", v["site_url"], yml_path)
-    yml = replace_entire_line(yml, "repo-url", v["repo_url"], yml_path)
-    yml = replace_entire_line(yml, "logo", v["logo_path"], yml_path)
+    # 3) Idempotente Wert-Ersetzungen (nur die gemeinten Keys, keine gleichnamigen in anderen Blöcken)
+    set_yaml_value(doc, ("website", "title"), _yaml_quote(v["site_title"]), yml_path)
+    set_yaml_value(doc, ("website", "site-url"), v["site_url"], yml_path)
+    set_yaml_value(doc, ("website", "repo-url"), v["repo_url"], yml_path)
+    set_yaml_value(doc, ("website", "navbar", "logo"), v["logo_path"], yml_path)
 
     # 4) Navbar.right gezielt (verhindert leere text:/href:)
-    yml = update_nav_right(yml, v.get("portal_text",""), v.get("portal_url",""), yml_path)
-
-    # 5) Footer: Org-Name + Impressum-Link robust
-    yml = simple_replace(yml, {
-        'your organisation (<span class="year"></span>) —':
-            f'{v["org_name"]} (<span class="year"></span>) —',
-    }, yml_path)
+    update_nav_right(doc, v.get("portal_text",""), v.get("portal_url",""), yml_path)
+
+    # 5) Footer: Org-Name + Impressum-Link robust (nur im page-footer-Block)
+    old = 'your organisation (<span class="year"></span>) —'
+    new = f'{v["org_name"]} (<span class="year"></span>) —'
+    lines = doc.subn(FOOTER_PATH, re.compile(re.escape(old)), lambda _: new)
+    if lines:
+        _log(f"[{yml_path.name}] page-footer '{old}' → '{new}' (count={len(lines)}, lines={lines})")
+    else:
+        _log(f"[{yml_path.name}] page-footer '{old}' → keine Fundstelle")
 
     href_cfg = (v.get("impressum_href", "#") or "#").strip()
     href_cfg = re.sub(r'\.(qmd|md)$', '.html', href_cfg, flags=re.I)  # .qmd/.md → .html für Footer-HTML
-    before = yml
-    yml = re.sub(r'(<a[^>]*class="impressum-link"[^>]*href=")[^"]*(")',
-                 rf'\1{href_cfg}\2', yml, flags=re.I)
-    if yml != before:
-        _log(f"[{yml_path.name}] regex_replace impressum-link → '{href_cfg}'")
+    lines = doc.subn(FOOTER_PATH, IMPRESSUM_LINK_RE, lambda m: m.group(1) + href_cfg + m.group(2))
+    if lines:
+        _log(f"[{yml_path.name}] page-footer impressum-link → '{href_cfg}' (lines={lines})")
     else:
         _log(f"[{yml_path.name}] impressum-link nicht gefunden (keine Änderung)")
 
     # 6) Eigene Domain whitelisten
-    yml = set_link_external_filter_line(yml, v.get("site_url",""), yml_path)
-
-    write_text(yml_path, yml)
+    set_link_external_filter_line(doc, v.get("site_url",""), yml_path)
 
 def update_scss(base: Path, v: dict):
     # Branding leer → keine SCSS-Anpassung
@@ -429,90 +1275,522 @@ def update_scss(base: Path, v: dict):
 
     css = base / "css" / "custom.scss"
     if css.exists():
-        t = read_text(css)
-        t2 = simple_replace(t, {
-            '$brand: #FB7171;': f'$brand: {v["brand_hex"]};',
-            '$brand-font: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell, Noto Sans, Arial, sans-serif;':
-                f'$brand-font: {v["brand_font"]};',
-        }, css)
-        if t2 != t:
-            write_text(css, t2)
+        with file_stats(css) as st:
+            t, st["bytes_read"] = read_text_sized(css)
+            t2 = simple_replace(t, {
+                '$brand: #FB7171;': f'$brand: {v["brand_hex"]};',
+                '$brand-font: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell, Noto Sans, Arial, sans-serif;':
+                    f'$brand-font: {v["brand_font"]};',
+            }, css, st)
+            if t2 != t:
+                st["bytes_written"] = write_text(css, t2)
+        emit_file(st)
 
     tdark = base / "css" / "theme-dark.scss"
     if tdark.exists():
-        t = read_text(tdark)
         brand_dark = v["brand_hex_dark"] if (v.get("brand_hex_dark") or "").strip() else v.get("brand_hex","")
         if not brand_dark:
             _log("[theme-dark.scss] Dark-Brand leer → keine Änderungen")
             return
-        t2 = simple_replace(t, {
-            '$brand: #FB7171;': f'$brand: {brand_dark};',
-            '$brand-font: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell, Noto Sans, Arial, sans-serif;':
-                f'$brand-font: {v["brand_font"]};',
-        }, tdark)
-        if t2 != t:
-            write_text(tdark, t2)
+        with file_stats(tdark) as st:
+            t, st["bytes_read"] = read_text_sized(tdark)
+            t2 = simple_replace(t, {
+                '$brand: #FB7171;': f'$brand: {brand_dark};',
+                '$brand-font: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell, Noto Sans, Arial, sans-serif;':
+                    f'$brand-font: {v["brand_font"]};',
+            }, tdark, st)
+            if t2 != t:
+                st["bytes_written"] = write_text(tdark, t2)
+        emit_file(st)
 
 def update_impressum(base: Path, v: dict):
     imp = base / "base" / "impressum.qmd"
     if not imp.exists():
         return
-    t = read_text(imp); before = t
-    for k in ["responsible_name","responsible_address","responsible_email","imprint_url",
-              "uni_name","uni_url","institute_name","institute_url","chair_name","chair_url"]:
-        t = t.replace(f"{{{{{k}}}}}", str(v.get(k,"")))
+    with file_stats(imp) as st:
+        t, st["bytes_read"] = read_text_sized(imp); before = t
+        t, hits = substitute_placeholders(t, {k: str(v.get(k,"")) for k in IMPRESSUM_KEYS})
+        st["replacements"] = sum(len(lines) for lines in hits.values())
+        if t != before:
+            st["bytes_written"] = write_text(imp, t)
+    emit_file(st)
     if t != before:
-        write_text(imp, t)
-        _log("[impressum.qmd] placeholders aktualisiert")
+        _log(f"[impressum.qmd] placeholders aktualisiert ({_fmt_hits(hits)})")
     else:
         _log("[impressum.qmd] keine placeholders gefunden/geändert")
 
-def update_qmd_placeholders(base: Path, v: dict):
-    keys = ["site_title","org_name","course_code","contact_email"]
-    repl = {f"{{{{{k}}}}}": str(v.get(k,"")) for k in keys}
+# Unterhalb dieser Dateianzahl lohnt der Start eines Worker-Pools nicht.
+PARALLEL_MIN_FILES = 32
+
+def _qmd_worker(path: Path, repl: dict[str, str]) -> tuple[dict[str, list[int]] | None, dict]:
+    """
+    Eine Datei lesen/ersetzen/schreiben; loggt NICHT (Logging + Events passieren geordnet im
+    Hauptprozess). Rückgabe: (Treffer oder None wenn unverändert, Datei-Stats).
+    """
+    with file_stats(path) as st:
+        if path.stat().st_size >= STREAM_MIN_BYTES:
+            hits, changed = substitute_stream(path, repl, st)
+        else:
+            t, st["bytes_read"] = read_text_sized(path)
+            t2, hits = substitute_placeholders(t, repl)
+            changed = t2 != t
+            if changed:
+                st["bytes_written"] = write_text(path, t2)
+        st["replacements"] = sum(len(lines) for lines in hits.values())
+    return (hits if changed else None), st
+
+def _thread_map(fn, n: int, *iterables) -> list:
+    """
+    Wie ThreadPoolExecutor.map, aber jeder Job läuft in einer eigenen Kopie des aufrufenden Kontexts:
+    Threads starten sonst mit leerem Kontext (kein _RUN → absolute Pfade in Events/Stats), fork erbt ihn.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        futures = [ex.submit(copy_context().run, fn, *args) for args in zip(*iterables)]
+        return [f.result() for f in futures]
+
+def _map_files(fn, paths: list[Path], *extra, jobs: int = 1):
+    """
+    fn(path, *extra) für alle paths; Ergebnisse in Eingabe-Reihenfolge.
+    Prozess-Pool (fork) wenn verfügbar, sonst Threads; seriell bei wenig Dateien/jobs=1.
+    """
+    if jobs <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        return [fn(path, *extra) for path in paths]
+    n = min(jobs, len(paths))
+    chunk = max(1, len(paths) // (n * 4))
+    extras = [[e] * len(paths) for e in extra]
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    if "fork" in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("fork")) as ex:
+            return list(ex.map(fn, paths, *extras, chunksize=chunk))
+    return _thread_map(fn, n, paths, *extras)
+
+def update_qmd_placeholders(base: Path, v: dict, paths: list[Path] | None = None, jobs: int = 1):
+    """
+    Ersetzt QMD_KEYS in allen gefundenen *.qmd unter base (oder nur in paths, falls angegeben).
+    Dateien werden sortiert bearbeitet → Log-Reihenfolge unabhängig von --jobs.
+    """
+    repl = {k: str(v.get(k,"")) for k in QMD_KEYS}
+    paths = sorted(discover_qmd(base)[0] if paths is None else paths)
     changed = 0
-    for path in base.rglob("*.qmd"):
-        t = read_text(path); orig = t
-        for old,new in repl.items():
-            t = t.replace(old, new)
-        if t != orig:
-            write_text(path, t)
-            _log(f"[{path.relative_to(BASE)}] placeholders aktualisiert")
+    for path, (hits, st) in zip(paths, _map_files(_qmd_worker, paths, repl, jobs=jobs)):
+        emit_file(st)
+        if hits is not None:
+            _log(f"[{path.relative_to(base)}] placeholders aktualisiert ({_fmt_hits(hits)})")
             changed += 1
     if not changed:
         _log("[*.qmd] keine placeholders geändert")
 
-def main():
+# ---------- Inkrementeller Modus: Manifest (Config-Hash + size/mtime/hash je Zieldatei) ----------
+MANIFEST_VERSION = 1
+
+def _sha256_file(path: Path) -> str:
+    import hashlib
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+@lru_cache(maxsize=None)
+def tool_hash() -> str:
+    """Hash von configure.py selbst (einmal pro Prozess, auch bei --batch)."""
+    return _sha256_file(Path(__file__))
+
+def config_hash(cfg: dict) -> str:
+    """Hash der normalisierten Konfiguration (nur SCHEMA-Keys, sortiert)."""
+    norm = {k: str(cfg.get(k,"") or "") for k,_,_,_ in SCHEMA}
+    import hashlib
+    return hashlib.sha256(json.dumps(norm, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def target_files(base: Path, qmd_files: list[Path]) -> list[Path]:
+    """Alle Dateien, die configure.py verändern kann (inkl. base/impressum.qmd über *.qmd)."""
+    files = [base / "_quarto.yml", base / "css" / "custom.scss", base / "css" / "theme-dark.scss"]
+    return [f for f in files if f.exists()] + qmd_files
+
+def load_manifest(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION else {}
+
+def _file_entry(path: Path, old: dict | None = None) -> dict:
+    """size/mtime gleich → alter Eintrag gilt; sonst Hash neu berechnen."""
+    st = path.stat()
+    if old and old.get("size") == st.st_size and old.get("mtime_ns") == st.st_mtime_ns:
+        return old
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": _sha256_file(path)}
+
+def scan_files(base: Path, files: list[Path], old_files: dict) -> tuple[dict, list[Path]]:
+    """
+    Vergleicht files mit den Manifest-Einträgen.
+    Rückgabe: (aktuelle Einträge, geänderte/neue Dateien).
+    """
+    entries: dict[str, dict] = {}
+    dirty: list[Path] = []
+    for path in files:
+        rel = path.relative_to(base).as_posix()
+        old = old_files.get(rel)
+        entry = _file_entry(path, old)
+        entries[rel] = entry
+        if old is None or entry["sha256"] != old.get("sha256"):
+            dirty.append(path)
+    return entries, dirty
+
+def save_manifest(path: Path, base: Path, cfg_hash: str, tool_hash: str,
+                  files: list[Path], entries: dict, dirty: list[Path], discovery: dict) -> None:
+    """Manifest nach dem Lauf schreiben; nur bearbeitete Dateien werden neu gehasht."""
+    dirty_set = set(dirty)
+    out: dict[str, dict] = {}
+    for f in files:
+        rel = f.relative_to(base).as_posix()
+        out[rel] = _file_entry(f) if f in dirty_set or rel not in entries else entries[rel]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_text(path, json.dumps({"version": MANIFEST_VERSION, "config": cfg_hash,
+                                 "tool": tool_hash, "files": out,
+                                 "discovery": refresh_discovery_cache(base, discovery)},
+                                indent=1) + "\n")
+    _log(f"save manifest → {path.relative_to(base)} ({len(out)} Dateien)")
+
+def configure_site(run: SiteRun) -> dict:
+    """
+    Ein vollständiger Lauf gegen run.root/run.base. Schreibt configure.log + Events des Laufs.
+    Rückgabe: Kennzahlen für die Batch-Übersicht.
+    """
+    token = _RUN.set(run)
+    try:
+        _configure(run)
+    finally:
+        _RUN.reset(token)
+    touched, skipped = write_counts(run)
+    return {"site": str(run.root), "status": "ok", "files": touched + skipped, "written": touched,
+            "replacements": sum(e["replacements"] for e in run.events
+                                if e["event"] == "file" and e["phase"] != "load_yaml"),
+            "wall_ms": _ms(time.perf_counter() - run.t0), "log": str(run.log_path)}
+
+def _configure(run: SiteRun) -> None:
+    base, cfg_path = run.base, run.cfg_path
     _log(f"=== configure.py run @ {datetime.now().isoformat(timespec='seconds')} ===")
 
     # 1) Konfig laden / fehlende ggf. abfragen
-    cfg = load_yaml(CFG_PATH)
-    cfg, changed = prompt_missing(cfg)
+    with phase("load_yaml"):
+        with file_stats(cfg_path) as st:
+            st["bytes_read"] = cfg_path.stat().st_size if cfg_path.exists() else 0
+            cfg = load_yaml(cfg_path)
+        emit_file(st)
+    cfg, changed = prompt_missing(cfg, run.noninteractive)
 
     # normalize to string
     for k,_,_,_ in SCHEMA:
         cfg[k] = str(cfg.get(k,"") or "")
 
-    if changed or not CFG_PATH.exists():
-        dump_yaml(CFG_PATH, cfg)
-        _log(f"save config → {CFG_PATH}")
-
-    # 2) Updates anwenden
-    update_quarto_yaml(BASE, cfg)
-    update_scss(BASE, cfg)
-    update_impressum(BASE, cfg)
-    update_qmd_placeholders(BASE, cfg)
+    if changed or not cfg_path.exists():
+        dump_yaml(cfg_path, cfg)
+        _log(f"save config → {cfg_path}")
+
+    # 2) Updates anwenden (inkrementell: nur was sich seit dem letzten Lauf geändert hat)
+    with phase("discover"):
+        manifest = load_manifest(run.manifest_path) if run.incremental else {}
+        qmd_files, discovery = discover_qmd(base, manifest.get("discovery"))
+        files = target_files(base, qmd_files)
+        dirty = files
+        entries: dict = {}
+        if run.incremental:
+            cfg_hash = config_hash(cfg)
+            if manifest.get("config") == cfg_hash and manifest.get("tool") == tool_hash():
+                entries, dirty = scan_files(base, files, manifest.get("files", {}))
+                _log(f"incremental: {len(dirty)} von {len(files)} Dateien geändert")
+            else:
+                _log("incremental: Config/Script geändert oder kein Manifest → vollständiger Lauf")
+
+    dirty_set = set(dirty)
+    if not dirty:
+        _log("incremental: keine Änderungen → übersprungen")
+    if base / "_quarto.yml" in dirty_set:
+        with phase("update_quarto_yaml"):
+            update_quarto_yaml(base, cfg)
+    if dirty is files or dirty_set & {base / "css" / "custom.scss", base / "css" / "theme-dark.scss"}:
+        with phase("update_scss"):
+            update_scss(base, cfg)
+    if base / "base" / "impressum.qmd" in dirty_set:
+        with phase("update_impressum"):
+            update_impressum(base, cfg)
+    if dirty:
+        with phase("update_qmd_placeholders"):
+            update_qmd_placeholders(base, cfg, [f for f in dirty if f.suffix == ".qmd"], jobs=run.jobs)
+
+    if run.incremental and (dirty or discovery is not manifest.get("discovery")):
+        with phase("save_manifest"):
+            save_manifest(run.manifest_path, base, cfg_hash, tool_hash(), files, entries, dirty, discovery)
 
     # 3) .nojekyll optional (nur falls docs/ bereits existiert)
-    docs = ROOT / "docs"
+    docs = run.root / "docs"
     if docs.exists():
-        (docs / ".nojekyll").write_text("", encoding="utf-8")
+        write_text(docs / ".nojekyll", "")
         _log("ensure docs/.nojekyll")
 
-    # 4) Log schreiben (liegt im Repo-Root; wird nicht veröffentlicht)
-    LOG_PATH.write_text("\n".join(LOG) + "\n", encoding="utf-8")
-    print(f"🧾 Log geschrieben nach: {LOG_PATH}")
+    touched, skipped = write_counts(run)
+    _log(f"Dateien: {touched} geschrieben, {skipped} unverändert (übersprungen)")
+
+    # 4) Log + Events schreiben (liegen im Repo-Root; werden nicht veröffentlicht)
+    write_run_logs(run)
+
+# ---------- Batch-Modus: viele Sites in einem Prozess (Regexe/Schema werden geteilt) ----------
+def _root_for_config(cfg_path: Path) -> Path | None:
+    """Projekt-Root zu einer site-config.yaml (liegt im Root oder in dessen template/)."""
+    for root in (cfg_path.parent.parent, cfg_path.parent):
+        base = locate_project(root)
+        if base is not None and cfg_path.parent in (root, base):
+            return root
+    return None
+
+def batch_targets(paths: list[str]) -> list[tuple[Path, Path | None, str | None]]:
+    """
+    --batch-Argumente → (Projekt-Root, Config-Pfad oder None = Default, Fehler oder None).
+    PATH: Projekt-Root, site-config.yaml oder Ordner mit je einem Projekt pro Unterordner.
+    """
+    out: list[tuple[Path, Path | None, str | None]] = []
+    for raw in paths:
+        path = Path(raw).resolve()
+        if path.is_file():
+            root = _root_for_config(path)
+            out.append((root or path.parent, path, None if root else "_quarto.yml not found (root or ./template)"))
+        elif locate_project(path) is not None:
+            out.append((path, None, None))
+        elif path.is_dir():
+            sites = [d for d in sorted(path.iterdir()) if d.is_dir() and locate_project(d) is not None]
+            out += [(d, None, None) for d in sites]
+            if not sites:
+                out.append((path, None, "keine Projekte gefunden"))
+        else:
+            out.append((path, None, "Pfad nicht gefunden"))
+    seen: set[Path] = set()
+    return [t for t in out if not (t[0] in seen or seen.add(t[0]))]
+
+def _batch_site(target: tuple[Path, Path | None, str | None], opts: dict) -> dict:
+    """Eine Site im Batch; Fehler werden als Zeile der Übersicht gemeldet, nicht geworfen."""
+    root, cfg_path, error = target
+    t0 = time.perf_counter()
+    if error is None:
+        base = locate_project(root)
+        try:
+            return configure_site(SiteRun(root, base, cfg_path or default_config_path(root, base), **opts))
+        except ConfigureError as e:
+            error = str(e)
+        except Exception as e:  # eine kaputte Site bricht den Batch nicht ab
+            error = f"{type(e).__name__}: {e}"
+    return {"site": str(root), "status": "error", "error": error, "files": 0, "written": 0,
+            "replacements": 0, "wall_ms": _ms(time.perf_counter() - t0), "log": None}
+
+def run_batch(paths: list[str], opts: dict, batch_jobs: int = 1) -> list[dict]:
+    """
+    Alle Sites nacheinander im selben Prozess, oder mit batch_jobs > 1 in einem Prozess-Pool
+    (fork: kompilierte Regexe/Schema werden vom Elternprozess geerbt); sonst Threads.
+    """
+    targets = batch_targets(paths)
+    n = min(max(1, batch_jobs), len(targets))
+    if n <= 1:
+        return [_batch_site(t, opts) for t in targets]
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    if "fork" in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("fork")) as ex:
+            return list(ex.map(_batch_site, targets, [opts] * len(targets)))
+    return _thread_map(_batch_site, n, targets, [opts] * len(targets))
+
+def print_batch_summary(results: list[dict]) -> None:
+    width = max([len(r["site"]) for r in results] + [4])
+    print(f"{'Site':<{width}}  Status  Dateien  geschrieben  ersetzt    wall ms")
+    for r in results:
+        print(f"{r['site']:<{width}}  {r['status']:<6}  {r['files']:>7}  {r['written']:>11}"
+              f"  {r['replacements']:>7}  {r['wall_ms']:>9.1f}")
+        if r["status"] != "ok":
+            print(f"{'':<{width}}  ❌ {r['error']}")
+    ok = sum(1 for r in results if r["status"] == "ok")
+    print(f"{'gesamt':<{width}}  {ok}/{len(results)} ok  {sum(r['files'] for r in results):>5}"
+          f"  {sum(r['written'] for r in results):>11}  {sum(r['replacements'] for r in results):>7}"
+          f"  {sum(r['wall_ms'] for r in results):>9.1f}")
+
+# ---------- Watch-Modus: Polling + Debounce, nur betroffene Updates erneut anwenden ----------
+QUARTO_YAML_KEYS = {"site_title", "org_name", "site_url", "repo_url", "logo_path", "portal_text",
+                    "portal_url", "impressum_href", "brand_hex", "dark_theme"}
+SCSS_KEYS = {"brand_hex", "brand_hex_dark", "brand_font"}
+
+def read_config(cfg_path: Path) -> dict:
+    """site-config.yaml laden, Pflichtwerte prüfen (ConfigureError), SCHEMA-Keys als str."""
+    cfg, _ = prompt_missing(load_yaml(cfg_path), True)
+    for k,_,_,_ in SCHEMA:
+        cfg[k] = str(cfg.get(k,"") or "")
+    return cfg
+
+def watch_snapshot(base: Path, cfg_path: Path, discovery: dict | None) -> tuple[dict[Path, tuple[int, int]], dict]:
+    """(size, mtime) aller beobachteten Dateien; der *.qmd-Baum über den discover_qmd-Cache."""
+    qmd_files, discovery = discover_qmd(base, discovery)
+    snap: dict[Path, tuple[int, int]] = {}
+    for path in [cfg_path, base / "_quarto.yml", *sorted((base / "css").glob("*.scss")), *qmd_files]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        snap[path] = (st.st_size, st.st_mtime_ns)
+    return snap, discovery
+
+def watch_plan(base: Path, changed: set[Path], keys: set[str]) -> dict:
+    """
+    Geänderte Dateien + geänderte Config-Keys → betroffene Update-Funktionen.
+    Beispiele: brand_hex → update_quarto_yaml (Theme-Zeilen) + update_scss;
+    neue/geänderte *.qmd → nur Platzhalter in genau diesen Dateien.
+    """
+    qmd = sorted(p for p in changed if p.suffix == ".qmd")
+    imp = base / "base" / "impressum.qmd"
+    return {
+        "update_quarto_yaml": bool(keys & QUARTO_YAML_KEYS) or base / "_quarto.yml" in changed,
+        "update_scss": bool(keys & SCSS_KEYS) or any(p.suffix == ".scss" for p in changed),
+        "update_impressum": bool(keys & set(IMPRESSUM_KEYS)) or imp in changed,
+        "qmd": None if keys & set(QMD_KEYS) else qmd,   # None = alle *.qmd
+    }
+
+def apply_plan(run: SiteRun, cfg: dict, plan: dict) -> None:
+    """Wie _configure, aber nur die Schritte aus plan; Log + Events wie bei einem normalen Lauf."""
+    base = run.base
+    token = _RUN.set(run)
+    try:
+        _log(f"=== configure.py --watch @ {datetime.now().isoformat(timespec='seconds')} ===")
+        if plan["update_quarto_yaml"]:
+            with phase("update_quarto_yaml"):
+                update_quarto_yaml(base, cfg)
+        if plan["update_scss"]:
+            with phase("update_scss"):
+                update_scss(base, cfg)
+        if plan["update_impressum"]:
+            with phase("update_impressum"):
+                update_impressum(base, cfg)
+        if plan["qmd"] is None or plan["qmd"]:
+            with phase("update_qmd_placeholders"):
+                update_qmd_placeholders(base, cfg, plan["qmd"], jobs=run.jobs)
+        touched, skipped = write_counts(run)
+        _log(f"Dateien: {touched} geschrieben, {skipped} unverändert (übersprungen)")
+        write_run_logs(run)
+    finally:
+        _RUN.reset(token)
+
+def _plan_steps(plan: dict) -> list[str]:
+    steps = [k for k in ("update_quarto_yaml", "update_scss", "update_impressum") if plan[k]]
+    if plan["qmd"] is None:
+        steps.append("update_qmd_placeholders (alle)")
+    elif plan["qmd"]:
+        steps.append(f"update_qmd_placeholders ({len(plan['qmd'])})")
+    return steps
+
+def _rel_to(path: Path, root: Path) -> str:
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return str(path)
+
+def watch(run: SiteRun, interval: float = 0.1, debounce: float = 0.2) -> int:
+    """
+    Erst ein vollständiger Lauf, dann Polling (stdlib, plattformunabhängig): Änderungen werden
+    gesammelt, bis debounce Sekunden Ruhe herrscht, und dann gezielt angewendet.
+    Eigene Schreibzugriffe landen im nächsten Snapshot und lösen keinen neuen Lauf aus.
+    """
+    root, base, cfg_path = run.root, run.base, run.cfg_path
+    try:
+        summary = configure_site(run)
+        cfg = read_config(cfg_path)
+    except ConfigureError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"📝 {summary['written']} Dateien geschrieben, {summary['files'] - summary['written']} unverändert")
+    snap, discovery = watch_snapshot(base, cfg_path, None)
+    print(f"👀 Beobachte {len(snap)} Dateien (alle {interval*1000:.0f} ms, Debounce {debounce*1000:.0f} ms)"
+          " – Strg+C beendet")
+    current, last_change = snap, None
+    try:
+        while True:
+            time.sleep(interval)
+            new, discovery = watch_snapshot(base, cfg_path, discovery)
+            if new != current:
+                current, last_change = new, time.monotonic()
+                continue
+            if last_change is None or time.monotonic() - last_change < debounce:
+                continue
+            last_change = None
+            changed = {p for p, sig in current.items() if snap.get(p) != sig}
+            t0 = time.perf_counter()
+            keys: set[str] = set()
+            if cfg_path in changed:
+                try:
+                    new_cfg = read_config(cfg_path)
+                except ConfigureError as e:
+                    print(f"❌ {e} → warte auf nächste Änderung")
+                    snap = current
+                    continue
+                keys = {k for k,_,_,_ in SCHEMA if new_cfg[k] != cfg[k]}
+                cfg = new_cfg
+            plan = watch_plan(base, changed - {cfg_path}, keys)
+            steps = _plan_steps(plan)
+            names = ", ".join(sorted(_rel_to(p, root) for p in changed))
+            if steps:
+                cycle = SiteRun(root, base, cfg_path, jobs=run.jobs)
+                apply_plan(cycle, cfg, plan)
+                touched, _ = write_counts(cycle)
+                print(f"🔁 {datetime.now():%H:%M:%S} {names}" + (f" ({', '.join(sorted(keys))})" if keys else "")
+                      + f" → {', '.join(steps)}: {touched} geschrieben ({_ms(time.perf_counter() - t0):.1f} ms)")
+            else:
+                print(f"🔁 {datetime.now():%H:%M:%S} {names} → nichts zu tun")
+            snap, discovery = watch_snapshot(base, cfg_path, discovery)   # eigene Writes übernehmen
+            current = snap
+    except KeyboardInterrupt:
+        print("👋 Watch beendet")
+    return 0
+
+def main(args: argparse.Namespace | None = None) -> int:
+    args = args or parse_args()
+    noninteractive = True if args.noninteractive or not args.interactive else False  # default non-interactive
+    jobs = max(1, args.jobs if args.jobs is not None else (os.cpu_count() or 1))
+
+    if args.batch:
+        # parallele Sites → je Site seriell, sonst überbucht der *.qmd-Pool die CPUs
+        if args.batch_jobs > 1 and args.jobs is None:
+            jobs = 1
+        opts = {"noninteractive": noninteractive, "incremental": args.incremental, "jobs": jobs}
+        results = run_batch(args.batch, opts, args.batch_jobs)
+        print_batch_summary(results)
+        return 0 if all(r["status"] == "ok" for r in results) else 1
+
+    root = Path(__file__).resolve().parents[1]
+    base = locate_project(root)
+    if base is None:
+        print("❌ _quarto.yml not found (root or ./template).")
+        return 1
+    cfg_path = Path(args.config) if args.config else default_config_path(root, base)
+    run = SiteRun(root, base, cfg_path, noninteractive=noninteractive,
+                  incremental=args.incremental, jobs=jobs)
+    if args.watch:
+        return watch(run, args.watch_interval, args.debounce / 1000)
+    try:
+        summary = configure_site(run)
+    except ConfigureError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"📝 {summary['written']} Dateien geschrieben, {summary['files'] - summary['written']} unverändert")
+    print(f"🧾 Log geschrieben nach: {run.log_path}")
+    if args.profile is not None:
+        print_profile_summary(run)
     print("✅ configuration applied. Commit & push to build on CI.")
+    return 0
 
 if __name__=="__main__":
-    main()
+    args = parse_args()
+    if args.profile:
+        import cProfile
+        prof = cProfile.Profile()
+        rc = prof.runcall(main, args)
+        prof.dump_stats(args.profile)
+        print(f"📈 cProfile-Stats geschrieben nach: {args.profile}")
+    else:
+        rc = main(args)
+    sys.exit(rc)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dedup_docs.py — findet inhaltsgleiche Dateien im gerenderten Output (docs/) und fasst sie zusammen.
+
+• Index: erst nach Größe gruppiert, gehasht (SHA-256) werden nur Dateien gleicher Größe
+• Modi:
+    --mode report     nur berichten (Default)
+    --mode rewrite    Verweise in HTML (src/href/srcset/poster) und CSS (url()) auf EINE
+                      kanonische Kopie umschreiben, Duplikate danach löschen
+    --mode hardlink   Duplikate durch Hardlinks ersetzen (spart nur lokalen Plattenplatz)
+• Sicherheitsregeln für rewrite: HTML-Seiten werden nie zusammengefasst; ein Duplikat wird nur
+    gelöscht, wenn es referenziert war, sein Dateiname in keiner JS/JSON-Datei vorkommt (dynamische
+    Verweise lassen sich nicht umschreiben) und nach dem Umschreiben kein Text-Asset mehr darauf
+    zeigt (Volltext-Scan über HTML/CSS/XML/SVG/…: inline style="…url()", <meta content>,
+    absolute URLs wie og:image, sitemap.xml)
+
+Hinweis: git speichert gleiche Inhalte ohnehin nur einmal (ein Blob). rewrite verkleinert
+vor allem Pages-Artefakt, Checkout und die Zahl der Tree-Einträge pro Commit.
+
+Beispiele:
+  python3 scripts/dedup_docs.py
+  python3 scripts/dedup_docs.py --mode rewrite
+  python3 scripts/dedup_docs.py --dir _site --mode hardlink --min-size 4096
+"""
+
+from pathlib import Path
+from urllib.parse import quote, unquote, urlsplit
+import argparse, hashlib, os, re, sys, tempfile
+
+from configure import locate_project, write_bytes
+
+ROOT = Path(__file__).resolve().parents[1]
+PAGE_SUFFIXES     = {".html", ".htm"}            # Seiten-URLs → nie zusammenfassen
+REFERRER_SUFFIXES = {".html", ".htm", ".css"}    # Verweise hierin werden umgeschrieben
+DYNAMIC_SUFFIXES  = {".js", ".mjs", ".json"}     # Verweise hierin können nicht umgeschrieben werden
+DERIVED_SUFFIXES  = {".gz", ".br"}               # Geschwister aus postrender.py
+SCAN_SUFFIXES     = REFERRER_SUFFIXES | {".xml", ".svg", ".txt", ".webmanifest"}   # Restverweise vor dem Löschen
+_TOKEN_STOP       = set(" \t\r\n\"'()<>,=;`")     # begrenzt einen Pfad/URL-Token im Volltext
+
+HTML_REF_RE   = re.compile(r"""(\b(?:src|href|poster|data-src)\s*=\s*)(["'])(.*?)\2""", re.I | re.S)
+HTML_SRCSET_RE = re.compile(r"""(\bsrcset\s*=\s*)(["'])(.*?)\2""", re.I | re.S)
+CSS_URL_RE    = re.compile(r"""(url\(\s*)(["']?)([^"')]+)\2(\s*\))""", re.I)
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+# ---------- Index ----------
+def find_duplicates(out_dir: Path, min_size: int) -> list[list[Path]]:
+    """Gruppen inhaltsgleicher Dateien (≥ 2), je Gruppe kanonische Kopie zuerst."""
+    by_size: dict[int, list[Path]] = {}
+    for dirpath, dirnames, filenames in os.walk(out_dir):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            path = Path(dirpath) / name
+            suffix = path.suffix.lower()
+            if name.startswith(".") or suffix in PAGE_SUFFIXES or suffix in DERIVED_SUFFIXES:
+                continue
+            st = path.lstat()
+            if st.st_size >= min_size and not path.is_symlink():
+                by_size.setdefault(st.st_size, []).append(path)
+    groups: list[list[Path]] = []
+    for paths in by_size.values():
+        if len(paths) < 2:
+            continue
+        by_hash: dict[str, list[Path]] = {}
+        for path in paths:
+            by_hash.setdefault(_sha256_file(path), []).append(path)
+        for same in by_hash.values():
+            if len(same) > 1:
+                # kanonisch: geringste Verzeichnistiefe, dann alphabetisch → stabil über Läufe
+                groups.append(sorted(same, key=lambda p: (len(p.parts), p.as_posix())))
+    return sorted(groups, key=lambda g: g[0].as_posix())
+
+# ---------- Verweise umschreiben ----------
+def _resolve(ref: str, referrer: Path, out_dir: Path) -> tuple[Path, str, bool] | None:
+    """Lokaler Verweis → (Zielpfad, Query/Fragment-Suffix, wurzel-absolut?); extern → None."""
+    parts = urlsplit(ref.strip())
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    tail = ("?" + parts.query if parts.query else "") + ("#" + parts.fragment if parts.fragment else "")
+    rooted = parts.path.startswith("/")
+    target = (out_dir / unquote(parts.path).lstrip("/")) if rooted else (referrer.parent / unquote(parts.path))
+    return Path(os.path.normpath(target)), tail, rooted
+
+def _href(target: Path, referrer: Path, out_dir: Path, rooted: bool) -> str:
+    rel = "/" + target.relative_to(out_dir).as_posix() if rooted else \
+        Path(os.path.relpath(target, referrer.parent)).as_posix()
+    return quote(rel, safe="/")
+
+def rewrite_references(referrer: Path, out_dir: Path, canon: dict[Path, Path],
+                       seen: set[Path]) -> tuple[bytes | None, int]:
+    """
+    Verweise einer HTML/CSS-Datei auf Duplikate → kanonische Kopie.
+    seen sammelt alle Duplikate, auf die verwiesen wurde. Rückgabe: (neue Bytes oder None, Anzahl).
+    """
+    text = referrer.read_bytes().decode("utf-8", "surrogateescape")   # verlustfrei hin und zurück
+    count = 0
+
+    def fix(ref: str) -> str:
+        nonlocal count
+        hit = _resolve(ref, referrer, out_dir)
+        if hit is None or hit[0] not in canon:
+            return ref
+        seen.add(hit[0])
+        count += 1
+        return _href(canon[hit[0]], referrer, out_dir, hit[2]) + hit[1]
+
+    def fix_srcset(value: str) -> str:
+        items = []
+        for item in value.split(","):
+            bits = item.strip().split(None, 1)
+            items.append(" ".join([fix(bits[0])] + bits[1:]) if bits else item)
+        return ", ".join(items)
+
+    if referrer.suffix.lower() == ".css":
+        new = CSS_URL_RE.sub(lambda m: m.group(1) + m.group(2) + fix(m.group(3)) + m.group(2) + m.group(4), text)
+    else:
+        new = HTML_REF_RE.sub(lambda m: m.group(1) + m.group(2) + fix(m.group(3)) + m.group(2), text)
+        new = HTML_SRCSET_RE.sub(lambda m: m.group(1) + m.group(2) + fix_srcset(m.group(3)) + m.group(2), new)
+    return (new.encode("utf-8", "surrogateescape") if new != text else None), count
+
+def _dynamic_names(out_dir: Path) -> str:
+    """Gesamter Text aller JS/JSON-Dateien (für die Dateinamen-Prüfung vor dem Löschen)."""
+    chunks = []
+    for path in out_dir.rglob("*"):
+        if path.suffix.lower() in DYNAMIC_SUFFIXES and path.is_file():
+            chunks.append(path.read_text(encoding="utf-8", errors="replace"))
+    return "\n".join(chunks)
+
+def _mentions(text: str, dup: Path, referrer: Path, out_dir: Path) -> bool:
+    """
+    Zeigt irgendein Token in text (Attribut, inline url(), <meta content>, absolute URL …) auf dup?
+    Um jedes Vorkommen des Dateinamens wird der umgebende Pfad/URL-Token aufgelöst; absolute URLs
+    zählen, wenn ihr Pfad auf den Output-Pfad von dup endet (Site-URL unbekannt → konservativ).
+    """
+    rel = "/" + dup.relative_to(out_dir).as_posix()
+    for name in {dup.name, quote(dup.name)}:
+        start = 0
+        while (i := text.find(name, start)) != -1:
+            start = i + 1
+            a, b = i, i + len(name)
+            if b < len(text) and text[b] not in _TOKEN_STOP and text[b] not in "?#":
+                continue   # längerer Name (x.png.webp, x.png2)
+            while a > 0 and text[a - 1] not in _TOKEN_STOP:
+                a -= 1
+            token = text[a:b]
+            parts = urlsplit(token)
+            if parts.scheme or parts.netloc:
+                if unquote(parts.path).endswith(rel):
+                    return True
+                continue
+            hit = _resolve(token, referrer, out_dir)
+            if hit is not None and hit[0] == dup:
+                return True
+    return False
+
+def still_referenced(out_dir: Path, candidates: set[Path], pending: dict[Path, bytes]) -> set[Path]:
+    """Kandidaten, auf die nach dem Umschreiben (pending = neuer Inhalt) noch ein Text-Asset zeigt."""
+    left: set[Path] = set()
+    for path in sorted(out_dir.rglob("*")):
+        if path.suffix.lower() not in SCAN_SUFFIXES or path in candidates or not path.is_file():
+            continue
+        data = pending[path] if path in pending else path.read_bytes()
+        text = data.decode("utf-8", "surrogateescape")
+        for dup in candidates - left:
+            if (dup.name in text or quote(dup.name) in text) and _mentions(text, dup, path, out_dir):
+                left.add(dup)
+    return left
+
+def _hardlink(canonical: Path, dup: Path) -> None:
+    """dup atomar durch einen Hardlink auf canonical ersetzen."""
+    fd, tmp = tempfile.mkstemp(dir=dup.parent, prefix=f".{dup.name}.", suffix=".tmp")
+    os.close(fd)
+    os.unlink(tmp)
+    os.link(canonical, tmp)
+    os.replace(tmp, dup)
+
+# ---------- Lauf ----------
+def dedup(out_dir: Path, mode: str = "report", min_size: int = 1, verbose: bool = False) -> int:
+    """Ein Durchlauf über out_dir im gewählten Modus; Rückgabe: gesparte Bytes."""
+    groups = find_duplicates(out_dir, min_size)
+    dup_files = sum(len(g) - 1 for g in groups)
+    dup_bytes = sum(g[0].stat().st_size * (len(g) - 1) for g in groups)
+    print(f"🔁 {len(groups)} Gruppen, {dup_files} Duplikate, {dup_bytes/1024:.0f} KB doppelt in {out_dir}")
+    if verbose or mode == "report":
+        for g in groups:
+            print(f"   {g[0].relative_to(out_dir)}  ← " + ", ".join(str(d.relative_to(out_dir)) for d in g[1:]))
+
+    saved = 0
+    if mode == "hardlink":
+        for g in groups:
+            for dup in g[1:]:
+                if not os.path.samefile(g[0], dup):
+                    _hardlink(g[0], dup)
+                    saved += dup.stat().st_size
+        print(f"🔗 Hardlinks gesetzt: {saved/1024:.0f} KB gespart (lokal; git/Pages sehen weiterhin Kopien)")
+
+    elif mode == "rewrite":
+        canon = {dup: g[0] for g in groups for dup in g[1:]}
+        seen: set[Path] = set()
+        rewritten = refs = 0
+        pending: dict[Path, bytes] = {}
+        for path in sorted(out_dir.rglob("*")):
+            if path.suffix.lower() in REFERRER_SUFFIXES and path.is_file():
+                new, n = rewrite_references(path, out_dir, canon, seen)
+                refs += n
+                if new is not None:
+                    pending[path] = new
+        dynamic = _dynamic_names(out_dir)
+        candidates = {d for d in seen if d.name not in dynamic}
+        removable = candidates - still_referenced(out_dir, candidates, pending)
+        for path, new in pending.items():
+            rewritten += bool(write_bytes(path, new))
+        for dup in sorted(removable):
+            saved += dup.stat().st_size
+            for sib in [dup] + [dup.with_name(dup.name + ext) for ext in DERIVED_SUFFIXES]:
+                if sib.exists():
+                    sib.unlink()
+        kept = dup_files - len(removable)
+        print(f"✏️  {refs} Verweise in {rewritten} Dateien umgeschrieben; {len(removable)} Duplikate entfernt,"
+              f" {saved/1024:.0f} KB gespart" + (f"; {kept} behalten (nicht, dynamisch oder nicht umschreibbar referenziert)" if kept else ""))
+    return saved
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Find and collapse duplicate files in the rendered site.")
+    p.add_argument("--dir", default=None,
+                   help="Output-Verzeichnis (Default: $QUARTO_PROJECT_OUTPUT_DIR, sonst docs/)")
+    p.add_argument("--mode", choices=["report", "rewrite", "hardlink"], default="report")
+    p.add_argument("--min-size", type=int, default=1, help="kleinere Dateien ignorieren (Bytes)")
+    p.add_argument("-v", "--verbose", action="store_true", help="alle Gruppen auflisten")
+    a = p.parse_args(argv)
+
+    base = locate_project(ROOT) or ROOT
+    out_dir = Path(a.dir or os.environ.get("QUARTO_PROJECT_OUTPUT_DIR") or base / "docs").absolute()
+    if not out_dir.is_dir():
+        print(f"❌ Output-Verzeichnis nicht gefunden: {out_dir}")
+        return 1
+    dedup(out_dir, a.mode, a.min_size, a.verbose)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
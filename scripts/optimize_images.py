@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+optimize_images.py — komprimiert images/ neu und erzeugt responsive WebP-Varianten.
+
+• Originale (JPG/PNG) werden neu komprimiert und nur ersetzt, wenn das Ergebnis kleiner ist:
+    Default nur PNG, verlustfrei (optimize, gleiche Pixel); JPEGs bleiben unangetastet, weil jedes
+    Neu-Kodieren Qualität kostet. Mit --quality N beide verlustbehaftet (JPEG-Qualität N, PNG auf
+    256 Farben quantisiert). Textblöcke, dpi, ICC/EXIF werden übernommen; gehen andere Metadaten
+    (gAMA, cHRM, sRGB …) verloren, bleibt das Original. Animierte Bilder (APNG) bleiben ganz unberührt
+• Varianten: <name>.<ext>.webp + <name>-<breite>.<ext>.webp je Breitenstufe unter images/responsive/,
+    dazu images/responsive/manifest.json (Originalbreite + Varianten je Bild). Eingebunden werden
+    sie nach dem Rendern von postrender.py: rewrite_pictures() setzt <img> auf passende Bilder in
+    <picture> mit WebP-<source srcset/sizes>; Browser ohne WebP laden weiter das Original
+• Cache (Default .quarto/image-cache/): Schlüssel = SHA-256(Einstellungen + Quellbytes),
+    Ausgaben inhaltsadressiert als Blobs → unveränderte Bilder werden nie neu berechnet
+• Benötigt Pillow (pip install Pillow); configure.py selbst braucht es nicht.
+
+Beispiele:
+  python3 scripts/optimize_images.py
+  python3 scripts/optimize_images.py --quality 82 --widths 640,1280 --jobs 4
+  python3 scripts/optimize_images.py --no-recompress --cache /tmp/image-cache
+"""
+
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import quote, unquote, urlsplit
+import argparse, hashlib, io, json, multiprocessing, os, re, sys, time
+
+from configure import locate_project, write_bytes, write_text
+
+ROOT = Path(__file__).resolve().parents[1]
+SUFFIXES = {".jpg", ".jpeg", ".png"}
+OUT_DIR_NAME = "responsive"      # unter images/ → wird über resources: images/** mit ausgeliefert
+CACHE_VERSION = 3                # 2: JPEG ohne --quality nicht mehr neu kodiert; 3: APNG/PNG-Metadaten
+VARIANT_MANIFEST = "manifest.json"
+VARIANT_MANIFEST_VERSION = 1
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+# ---------- Einstellungen + Cache-Schlüssel ----------
+def settings_from_args(a: argparse.Namespace) -> dict:
+    from PIL import __version__ as pil_version  # Encoder-Version gehört zum Schlüssel
+    return {"v": CACHE_VERSION, "pillow": pil_version, "quality": a.quality,
+            "webp": not a.no_webp, "webp_quality": a.webp_quality,
+            "widths": sorted({w for w in a.widths if w > 0}), "recompress": not a.no_recompress}
+
+def cache_key(settings: dict, data: bytes) -> str:
+    h = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8"))
+    h.update(b"\0")
+    h.update(data)
+    return h.hexdigest()
+
+class ImageCache:
+    """
+    index.json: Schlüssel → {Ausgabename: Blob-Hash}; Blobs unter blobs/<2>/<sha256>.
+    Ausgabename "" = neu komprimiertes Original, sonst Dateiname der Variante.
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self.index_path = path / "index.json"
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.index: dict[str, dict[str, str]] = data.get("entries", {}) if data.get("version") == CACHE_VERSION else {}
+
+    def _blob(self, sha: str) -> Path:
+        return self.path / "blobs" / sha[:2] / sha
+
+    def get(self, key: str) -> dict[str, bytes] | None:
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        try:
+            return {name: self._blob(sha).read_bytes() for name, sha in entry.items()}
+        except FileNotFoundError:
+            return None   # Blob fehlt (Cache teilweise gelöscht) → neu berechnen
+
+    def put(self, key: str, outputs: dict[str, bytes]) -> None:
+        entry = {}
+        for name, data in outputs.items():
+            sha = _sha256(data)
+            blob = self._blob(sha)
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                write_bytes(blob, data)
+            entry[name] = sha
+        self.index[key] = entry
+
+    def save(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        write_text(self.index_path, json.dumps({"version": CACHE_VERSION, "entries": self.index},
+                                               indent=1, sort_keys=True) + "\n")
+
+# ---------- Bildverarbeitung (läuft im Worker) ----------
+def _has_alpha(im) -> bool:
+    return im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+
+# PNG-Metadaten, die Pillow nicht zurückschreibt (gAMA, cHRM, sRGB …) → Original behalten
+_PNG_IGNORE_INFO = {"interlace", "icc_profile", "exif", "transparency"}
+
+def _png_params(im) -> dict:
+    """Save-Parameter, die Textblöcke (tEXt/zTXt/iTXt), dpi (pHYs) und ICC/EXIF mitnehmen."""
+    from PIL import PngImagePlugin
+    params = {k: im.info[k] for k in ("icc_profile", "exif") if im.info.get(k)}
+    if getattr(im, "text", None):
+        info = PngImagePlugin.PngInfo()
+        for k, v in im.text.items():
+            info.add_text(k, v)   # iTXt-Werte behalten Sprache/übersetzten Schlüssel
+        params["pnginfo"] = info
+    if "dpi" in im.info:
+        params["dpi"] = im.info["dpi"]
+    return params
+
+def _same_png_info(old: dict, new_bytes: bytes) -> bool:
+    from PIL import Image
+    with Image.open(io.BytesIO(new_bytes)) as new:
+        new.load()   # Textblöcke hinter IDAT
+        new_info = new.info
+    keys = (old.keys() | new_info.keys()) - _PNG_IGNORE_INFO
+    return all(old.get(k) == new_info.get(k) for k in keys)
+
+def _recompress(im, fmt: str, quality: int | None) -> bytes | None:
+    """Neu kodiertes Bild; None, wenn dabei PNG-Metadaten verloren gingen."""
+    from PIL import Image
+    buf = io.BytesIO()
+    if fmt == "JPEG":   # nur mit --quality aufgerufen (siehe process_image)
+        extra = {k: im.info[k] for k in ("icc_profile", "exif") if im.info.get(k)}
+        im.save(buf, "JPEG", optimize=True, progressive=True, quality=quality, **extra)
+        return buf.getvalue()
+    info, params = dict(im.info), _png_params(im)
+    if quality is not None and im.mode in ("RGB", "RGBA"):
+        im = im.quantize(256, method=Image.Quantize.FASTOCTREE)
+    im.save(buf, "PNG", optimize=True, **params)
+    data = buf.getvalue()
+    return data if _same_png_info(info, data) else None
+
+def process_image(path: Path, settings: dict) -> dict[str, bytes]:
+    """Eine Quelle → {Ausgabename: Bytes}; "" nur, wenn das neu komprimierte Original kleiner ist."""
+    from PIL import Image
+    data = path.read_bytes()
+    out: dict[str, bytes] = {}
+    with Image.open(io.BytesIO(data)) as im:
+        if getattr(im, "is_animated", False):
+            return out   # APNG/MPO: Neu-Kodieren wie WebP-Variante kennen nur das erste Bild
+        im.load()
+        # JPEG nur verlustbehaftet (--quality): ein Neu-Kodieren wäre nie verlustfrei
+        if settings["recompress"] and (im.format == "PNG" or (im.format == "JPEG" and settings["quality"] is not None)):
+            new = _recompress(im, im.format, settings["quality"])
+            if new is not None and len(new) < len(data):
+                out[""] = new
+        if settings["webp"]:
+            rgb = im.convert("RGBA" if _has_alpha(im) else "RGB")
+            sizes = [(None, rgb)]
+            for w in settings["widths"]:
+                if w < rgb.width:
+                    h = max(1, round(rgb.height * w / rgb.width))
+                    sizes.append((w, rgb.resize((w, h), Image.Resampling.LANCZOS)))
+            ext = path.suffix.lower()   # mof.jpg und mof.png dürfen sich nicht überschreiben
+            for w, img in sizes:
+                buf = io.BytesIO()
+                img.save(buf, "WEBP", quality=settings["webp_quality"])
+                out[f"{path.stem}{ext}.webp" if w is None else f"{path.stem}-{w}{ext}.webp"] = buf.getvalue()
+    return out
+
+def _map_images(paths: list[Path], settings: dict, jobs: int) -> list[dict[str, bytes]]:
+    """process_image für alle paths, Ergebnisse in Eingabe-Reihenfolge (wie configure._map_files)."""
+    if jobs <= 1 or len(paths) < 2:
+        return [process_image(p, settings) for p in paths]
+    n = min(jobs, len(paths))
+    if "fork" in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("fork")) as ex:
+            return list(ex.map(process_image, paths, [settings] * len(paths)))
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        return list(ex.map(process_image, paths, [settings] * len(paths)))
+
+# ---------- Einbinden: <img> → <picture> im gerenderten HTML (aufgerufen von postrender.py) ----------
+_PICTURE_OR_IMG_RE = re.compile(r"<picture\b.*?</picture\s*>|<img\b[^>]*>", re.I | re.S)
+_IMG_SRC_RE        = re.compile(r"""\bsrc\s*=\s*(["'])(.*?)\1""", re.I | re.S)
+_IMG_SRCSET_RE     = re.compile(r"\bsrcset\s*=", re.I)
+
+def write_variant_manifest(out_dir: Path, images: dict[str, dict]) -> int:
+    """images: Quellpfad relativ zu images/ → {"width": px, "variants": [[Name relativ zu out_dir, px], …]}."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return write_text(out_dir / VARIANT_MANIFEST, json.dumps(
+        {"version": VARIANT_MANIFEST_VERSION, "images": images}, indent=1, sort_keys=True) + "\n")
+
+def _picture(tag: str, page: Path, site: Path, src_dir: Path, entries: dict[str, dict]) -> str:
+    m = _IMG_SRC_RE.search(tag)
+    if m is None or _IMG_SRCSET_RE.search(tag):
+        return tag   # ohne src oder mit eigenem srcset: nicht anfassen
+    parts = urlsplit(m.group(2).strip())
+    if parts.scheme or parts.netloc or not parts.path:
+        return tag
+    rel_path = unquote(parts.path)
+    target = Path(os.path.normpath(site / rel_path.lstrip("/") if rel_path.startswith("/") else page.parent / rel_path))
+    try:
+        key = target.relative_to(src_dir).as_posix()
+    except ValueError:
+        return tag
+    entry = entries.get(key)
+    if not entry or not entry.get("variants"):
+        return tag
+    var_dir = src_dir / OUT_DIR_NAME
+    srcset = ", ".join(f"{quote(Path(os.path.relpath(var_dir / name, page.parent)).as_posix(), safe='/')} {w}w"
+                       for name, w in sorted(entry["variants"], key=lambda v: v[1]))
+    sizes = f"(max-width: {entry['width']}px) 100vw, {entry['width']}px"
+    return f'<picture><source type="image/webp" srcset="{srcset}" sizes="{sizes}">{tag}</picture>'
+
+def rewrite_pictures(site: Path, images: str = "images") -> int:
+    """
+    <img> auf Bilder mit WebP-Varianten in allen HTML-Seiten von site in <picture> einbetten
+    (idempotent: vorhandene <picture>-Blöcke bleiben unverändert). Rückgabe: geänderte Seiten.
+    """
+    src_dir = site / images
+    try:
+        manifest = json.loads((src_dir / OUT_DIR_NAME / VARIANT_MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return 0
+    entries = manifest.get("images", {}) if manifest.get("version") == VARIANT_MANIFEST_VERSION else {}
+    if not entries:
+        return 0
+    changed = pictures = 0
+    for page in sorted(site.rglob("*.html")):
+        text = page.read_bytes().decode("utf-8", "surrogateescape")
+        if "<img" not in text:
+            continue
+        new = _PICTURE_OR_IMG_RE.sub(lambda m: m.group(0) if m.group(0)[:8].lower() == "<picture"
+                                     else _picture(m.group(0), page, site, src_dir, entries), text)
+        if new != text:
+            pictures += new.count("<picture><source") - text.count("<picture><source")
+            changed += bool(write_bytes(page, new.encode("utf-8", "surrogateescape")))
+    print(f"🖼  <picture> mit WebP-Varianten: {pictures} Bilder in {changed} Seiten")
+    return changed
+
+# ---------- Lauf ----------
+def find_sources(src: Path, out_dir: Path) -> list[Path]:
+    return sorted(p for p in src.rglob("*")
+                  if p.suffix.lower() in SUFFIXES and p.is_file() and out_dir not in p.parents)
+
+def prune_variants(out_dir: Path, keep: set[Path]) -> int:
+    """Varianten entfernen, deren Quelle es nicht mehr gibt (out_dir gehört nur diesem Skript)."""
+    removed = 0
+    if out_dir.is_dir():
+        for p in out_dir.rglob("*.webp"):
+            if p not in keep:
+                p.unlink()
+                removed += 1
+    return removed
+
+def _mb(n: int) -> str:
+    return f"{n / 1e6:.1f} MB"
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Recompress images/ and build responsive WebP variants (cached).")
+    p.add_argument("--src", default=None, help="Bildordner (Default: images/ des Projekts)")
+    p.add_argument("--quality", type=int, default=None, help="verlustbehaftet mit JPEG-Qualität N (Default: nur PNG verlustfrei, JPEG unverändert)")
+    p.add_argument("--webp-quality", type=int, default=80, help="Qualität der WebP-Varianten (Default: 80)")
+    p.add_argument("--widths", type=lambda s: [int(x) for x in s.split(",") if x.strip()],
+                   default=[480, 960, 1600], help="Breitenstufen, kommagetrennt (Default: 480,960,1600)")
+    p.add_argument("--no-webp", action="store_true", help="keine WebP-Varianten erzeugen")
+    p.add_argument("--no-recompress", action="store_true", help="Originale nicht anfassen")
+    p.add_argument("--cache", default=None, help="Cache-Ordner (Default: .quarto/image-cache)")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="Worker-Anzahl (Default: CPU-Anzahl)")
+    a = p.parse_args(argv)
+
+    try:
+        settings = settings_from_args(a)
+    except ImportError:
+        print("❌ Pillow nicht installiert (pip install Pillow).")
+        return 1
+    base = locate_project(ROOT) or ROOT
+    src = Path(a.src) if a.src else base / "images"
+    out_dir = src / OUT_DIR_NAME
+    cache = ImageCache(Path(a.cache) if a.cache else base / ".quarto" / "image-cache")
+    jobs = max(1, a.jobs if a.jobs is not None else (os.cpu_count() or 1))
+    t0 = time.perf_counter()
+
+    # 1) Quellen hashen; Cache-Treffer brauchen keinen Worker
+    sources = find_sources(src, out_dir)
+    keys, todo = {}, []
+    for path in sources:
+        keys[path] = cache_key(settings, path.read_bytes())
+        if keys[path] not in cache.index:
+            todo.append(path)
+
+    # 2) Rest parallel berechnen und inhaltsadressiert ablegen
+    for path, outputs in zip(todo, _map_images(todo, settings, jobs)):
+        cache.put(keys[path], outputs)
+        if "" in outputs:
+            # optimiertes Original = künftige Quelle → beim nächsten Lauf direkt ein Treffer
+            cache.put(cache_key(settings, outputs[""]), {k: v for k, v in outputs.items() if k})
+
+    # 3) Ausgaben schreiben (nur geänderte Bytes; mtimes bleiben sonst stabil)
+    before = after = variant_bytes = written = 0
+    keep: set[Path] = set()
+    variants: dict[str, dict] = {}
+    for path in sources:
+        outputs = cache.get(keys[path])
+        if outputs is None:   # Blob fehlte → einmal neu berechnen
+            outputs = process_image(path, settings)
+            cache.put(keys[path], outputs)
+        size = path.stat().st_size
+        before += size
+        after += len(outputs[""]) if "" in outputs else size
+        for name, data in outputs.items():
+            target = path if name == "" else out_dir / path.parent.relative_to(src) / name
+            if name:
+                keep.add(target)
+                variant_bytes += len(data)
+                target.parent.mkdir(parents=True, exist_ok=True)
+            written += bool(write_bytes(target, data))
+        names = [n for n in outputs if n]
+        if names:
+            from PIL import Image
+            with Image.open(path) as im:   # liest nur den Header
+                width = im.width
+            sub = path.parent.relative_to(src)
+            variants[path.relative_to(src).as_posix()] = {"width": width, "variants": [
+                [(sub / n).as_posix(), width if n == f"{path.stem}{path.suffix.lower()}.webp"
+                 else int(n[len(path.stem) + 1:].split(".", 1)[0])] for n in sorted(names)]}
+    removed = prune_variants(out_dir, keep)
+    written += bool(write_variant_manifest(out_dir, variants))
+    cache.save()
+
+    print(f"🖼  {len(sources)} Bilder: {len(todo)} neu berechnet, {len(sources) - len(todo)} aus dem Cache"
+          f" ({time.perf_counter() - t0:.1f} s, {jobs} Worker)")
+    print(f"   Originale: {_mb(before)} → {_mb(after)} (−{_mb(before - after)})")
+    print(f"   Varianten: {len(keep)} Dateien, {_mb(variant_bytes)} in {out_dir}"
+          + (f", {removed} veraltete entfernt" if removed else ""))
+    print(f"📝 {written} Dateien geschrieben")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+postrender.py — minifiziert das gerenderte Output-Verzeichnis und legt vorkomprimierte
+.gz/.br-Geschwister für alle Text-Assets an (für Server mit gzip_static/brotli_static).
+
+• Als Quarto-post-render-Skript nutzbar (liest QUARTO_PROJECT_OUTPUT_DIR), sonst --dir
+• Minify (konservativ):
+    HTML  Kommentare + Whitespace-Läufe außerhalb von pre/code/textarea/script/style
+    CSS   Kommentare (außer /*! … */) + Whitespace um { } ; ,
+    JSON  kompakte Separatoren
+    JS    nur wenn rjsmin installiert ist; *.min.js/*.min.css bleiben unverändert
+• .gz immer (stdlib, mtime=0 → reproduzierbar), .br wenn das Modul brotli installiert ist;
+    ein Geschwister wird nur geschrieben, wenn es kleiner als das Original ist
+• Vorab: <img> auf Bilder mit WebP-Varianten (optimize_images.py) in <picture> einbetten;
+    --no-pictures schaltet das ab
+• Vorab: Duplikate zusammenfassen (dedup_docs.py --mode rewrite), damit Minify/Kompression
+    nur noch eine Kopie sehen; --no-dedup schaltet das ab
+• Danach: search.json in Shards je Abschnitt zerlegen (search_shards.py), damit die Shards
+    mitkomprimiert werden; --no-search-shards schaltet das ab
+• Manifest (.quarto/postrender-manifest.json): Datei-Hash vor/nach Minify → unveränderte
+    Dateien werden beim nächsten Lauf übersprungen (im CI hält actions/cache das Manifest
+    zwischen den Läufen, siehe quarto-pages.yml)
+
+Beispiele:
+  python3 scripts/postrender.py                  # docs/
+  python3 scripts/postrender.py --dir _site --jobs 4
+  QUARTO_PROFILE=ci quarto render                # ruft das Skript über _quarto-ci.yml auf
+"""
+
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import argparse, gzip, hashlib, json, multiprocessing, os, re, sys, time
+
+from configure import locate_project, write_bytes, write_text
+from dedup_docs import dedup
+from optimize_images import rewrite_pictures
+from search_shards import shard_search
+
+ROOT = Path(__file__).resolve().parents[1]
+TEXT_SUFFIXES = {".html", ".htm", ".css", ".js", ".mjs", ".json", ".xml", ".svg", ".txt", ".map"}
+SIBLINGS = (".gz", ".br")
+MANIFEST_VERSION = 1
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+try:
+    import rjsmin  # type: ignore
+except ImportError:
+    rjsmin = None
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+# ---------- Minify ----------
+_HTML_RAW_RE     = re.compile(r"<(pre|code|textarea|script|style)\b.*?</\1\s*>", re.I | re.S)
+_HTML_COMMENT_RE = re.compile(r"<!--(?!\[if|\s*\[endif|!).*?-->", re.S)
+_HTML_NL_RE      = re.compile(r"[ \t\r]*\n[ \t\r\n]*")
+_HTML_WS_RE      = re.compile(r"[ \t\r]{2,}")
+
+def minify_html(text: str) -> str:
+    """Whitespace-Läufe → ein Zeichen (Newline bleibt Newline); Roh-Blöcke bleiben unangetastet."""
+    out, pos = [], 0
+    for m in _HTML_RAW_RE.finditer(text):
+        out.append(_minify_html_part(text[pos:m.start()]))
+        out.append(m.group(0))
+        pos = m.end()
+    out.append(_minify_html_part(text[pos:]))
+    return "".join(out)
+
+def _minify_html_part(part: str) -> str:
+    part = _HTML_COMMENT_RE.sub("", part)
+    return _HTML_WS_RE.sub(" ", _HTML_NL_RE.sub("\n", part))
+
+_CSS_STR = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+_CSS_COMMENT_RE = re.compile(r"(" + _CSS_STR + r")|/\*(?!!).*?\*/", re.S)
+_CSS_WS_RE      = re.compile(r"(" + _CSS_STR + r")|\s+")
+_CSS_PUNCT_RE   = re.compile(r"(" + _CSS_STR + r")| ?([{};,]) ?")
+
+def minify_css(text: str) -> str:
+    keep = lambda m: m.group(1) or " "
+    text = _CSS_COMMENT_RE.sub(keep, text)   # Kommentar → Leerzeichen (trennt Tokens weiter)
+    text = _CSS_WS_RE.sub(keep, text)
+    return _CSS_PUNCT_RE.sub(lambda m: m.group(1) or m.group(2), text).strip()
+
+def minify(path: Path, data: bytes) -> bytes:
+    name = path.name.lower()
+    if ".min." in name:
+        return data
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data
+    suffix = path.suffix.lower()
+    if suffix in (".html", ".htm"):
+        text = minify_html(text)
+    elif suffix == ".css":
+        text = minify_css(text)
+    elif suffix == ".json":
+        try:
+            text = json.dumps(json.loads(text), ensure_ascii=False, separators=(",", ":"))
+        except ValueError:
+            return data
+    elif suffix in (".js", ".mjs") and rjsmin is not None:
+        text = rjsmin.jsmin(text)
+    else:
+        return data
+    new = text.encode("utf-8")
+    return new if len(new) < len(data) else data
+
+# ---------- Vorkomprimierung ----------
+def compress(data: bytes) -> dict[str, bytes]:
+    out = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        out[".br"] = brotli.compress(data, quality=11)
+    return out
+
+def _siblings_ok(path: Path, entry: dict) -> bool:
+    return all(path.with_name(path.name + ext).exists() == bool(entry.get(ext)) for ext in SIBLINGS)
+
+def process_file(path: Path, entry: dict | None, do_minify: bool) -> dict:
+    """
+    Eine Datei: Minify → schreiben → .gz/.br. Läuft im Worker und schreibt selbst
+    (jede Datei gehört genau einem Worker). Rückgabe: Manifest-Eintrag + Kennzahlen.
+    """
+    data = path.read_bytes()
+    src = _sha256(data)
+    if entry and src == entry["out"] and _siblings_ok(path, entry):
+        return {**entry, "status": "cached", "size": len(data), "min": len(data)}
+    out = minify(path, data) if do_minify else data
+    digest = _sha256(out) if out is not data else src
+    write_bytes(path, out)
+    rec = {"src": src, "out": digest, "status": "new", "size": len(data), "min": len(out)}
+    if entry and digest == entry["out"] and _siblings_ok(path, entry):
+        # Quelle wurde neu kopiert (z. B. site_libs), Ergebnis identisch → nicht neu komprimieren
+        return {**rec, **{ext: entry.get(ext) for ext in SIBLINGS}, "status": "reminified"}
+    packed = compress(out)
+    for ext in SIBLINGS:
+        sib = path.with_name(path.name + ext)
+        blob = packed.get(ext)
+        if blob is not None and len(blob) < len(out):
+            write_bytes(sib, blob)
+            rec[ext] = len(blob)
+        else:
+            rec[ext] = 0
+            if sib.exists():
+                sib.unlink()
+    return rec
+
+def _map_files(paths: list[Path], entries: list[dict | None], do_minify: bool, jobs: int) -> list[dict]:
+    """Wie configure._map_files: fork-Prozess-Pool, sonst Threads; seriell bei jobs=1."""
+    if jobs <= 1 or len(paths) < 2:
+        return [process_file(p, e, do_minify) for p, e in zip(paths, entries)]
+    n = min(jobs, len(paths))
+    chunk = max(1, len(paths) // (n * 4))
+    flags = [do_minify] * len(paths)
+    if "fork" in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("fork")) as ex:
+            return list(ex.map(process_file, paths, entries, flags, chunksize=chunk))
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        return list(ex.map(process_file, paths, entries, flags))
+
+# ---------- Lauf ----------
+def find_text_assets(out_dir: Path) -> tuple[list[Path], list[Path]]:
+    """(Text-Assets, verwaiste .gz/.br ohne Original)."""
+    assets, orphans = [], []
+    for dirpath, dirnames, filenames in os.walk(out_dir):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        d = Path(dirpath)
+        names = set(filenames)
+        for name in filenames:
+            stem, ext = os.path.splitext(name)
+            if ext in SIBLINGS:
+                if os.path.splitext(stem)[1].lower() in TEXT_SUFFIXES and stem not in names:
+                    orphans.append(d / name)
+            elif ext.lower() in TEXT_SUFFIXES:
+                assets.append(d / name)
+    return sorted(assets), orphans
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Minify and precompress (.gz/.br) a rendered Quarto site.")
+    p.add_argument("--dir", default=None,
+                   help="Output-Verzeichnis (Default: $QUARTO_PROJECT_OUTPUT_DIR, sonst docs/)")
+    p.add_argument("--no-minify", action="store_true", help="nur komprimieren")
+    p.add_argument("--no-pictures", action="store_true", help="<img> nicht in <picture> mit WebP-Varianten einbetten")
+    p.add_argument("--no-dedup", action="store_true", help="Duplikate nicht zusammenfassen")
+    p.add_argument("--no-search-shards", action="store_true", help="search.json nicht in Shards zerlegen")
+    p.add_argument("-j", "--jobs", type=int, default=None, help="Worker-Anzahl (Default: CPU-Anzahl)")
+    a = p.parse_args(argv)
+
+    base = locate_project(ROOT) or ROOT
+    out_dir = Path(a.dir or os.environ.get("QUARTO_PROJECT_OUTPUT_DIR") or base / "docs")
+    if not out_dir.is_absolute():
+        out_dir = Path.cwd() / out_dir
+    if not out_dir.is_dir():
+        print(f"❌ Output-Verzeichnis nicht gefunden: {out_dir}")
+        return 1
+    jobs = max(1, a.jobs if a.jobs is not None else (os.cpu_count() or 1))
+    t0 = time.perf_counter()
+    if not a.no_pictures:
+        rewrite_pictures(out_dir)   # vor dedup: Verweise zeigen hier noch auf images/
+    if not a.no_dedup:
+        dedup(out_dir, "rewrite")
+    if not a.no_search_shards:
+        shard_search(out_dir)
+
+    # Manifest gilt nur für dieselben Einstellungen (Minify an/aus, brotli/rjsmin verfügbar)
+    settings = {"minify": not a.no_minify, "brotli": brotli is not None, "rjsmin": rjsmin is not None}
+    manifest_path = base / ".quarto" / "postrender-manifest.json"
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+    old = manifest.get("files", {}) if (manifest.get("version") == MANIFEST_VERSION
+                                        and manifest.get("settings") == settings) else {}
+
+    assets, orphans = find_text_assets(out_dir)
+    rels = [f.relative_to(out_dir).as_posix() for f in assets]
+    results = _map_files(assets, [old.get(r) for r in rels], not a.no_minify, jobs)
+    for f in orphans:
+        f.unlink()
+
+    files = {r: {k: res[k] for k in ("src", "out", *SIBLINGS)} for r, res in zip(rels, results)}
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    write_text(manifest_path, json.dumps({"version": MANIFEST_VERSION, "settings": settings,
+                                          "files": files}, indent=1, sort_keys=True) + "\n")
+
+    done = [r for r in results if r["status"] != "cached"]
+    size, small = sum(r["size"] for r in done), sum(r["min"] for r in done)
+    gz = sum(r[".gz"] or r["min"] for r in results)
+    br = sum(r[".br"] or r["min"] for r in results)
+    total = sum(r["min"] for r in results)
+    print(f"🗜  {len(results)} Text-Assets in {out_dir}: {len(done)} bearbeitet,"
+          f" {len(results) - len(done)} unverändert ({time.perf_counter() - t0:.1f} s, {jobs} Worker)")
+    print(f"   Minify: {size/1024:.0f} KB → {small/1024:.0f} KB")
+    print(f"   Transfer: {total/1024:.0f} KB roh, {gz/1024:.0f} KB gzip"
+          + (f", {br/1024:.0f} KB brotli" if brotli is not None else " (brotli nicht installiert → keine .br)"))
+    if orphans:
+        print(f"   {len(orphans)} verwaiste .gz/.br entfernt")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+render_changed.py — rendert nur die Seiten neu, die von einer Änderung betroffen sind.
+
+Abhängigkeitsgraph je Seite (*.qmd, ohne _-Dateien):
+  Seite selbst, {{< include … >}} (rekursiv), Bilder (![](…), <img src>, include_graphics),
+  Dateipfade im Front Matter, _metadata.yml der Ordnerkette
+Globale Abhängigkeiten (→ vollständiger Render):
+  _quarto.yml + Profile (_quarto-*.yml), site-config.yaml, _metadata.yml im Root, alle in
+  _quarto.yml genannten Dateien (Theme-SCSS, css, include-after-body …), *.scss/*.css,
+  _extensions/, neue/gelöschte Seiten, geänderter Front Matter (sidebar: contents: auto)
+  sowie jede geänderte Datei, die weder ignoriert noch im Graph ist (sicherer Default)
+
+Änderungen kommen aus git (--since REF: Diff REF ↔ Arbeitsbaum + untracked; mit --until HEAD nur
+die Commits dazwischen, wie im CI, wo configure.py/optimize_images.py vorher den Arbeitsbaum
+umschreiben) oder aus dem Manifest .quarto/render-manifest.json (Hashes nach dem letzten erfolgreichen Render; sieht nur
+Dateien im Graph — Datendateien, die Code-Chunks lesen, erkennt nur der git-Modus).
+
+Beispiele:
+  python3 scripts/render_changed.py --dry-run
+  python3 scripts/render_changed.py --since origin/main -- --log-level=INFO
+  python3 scripts/render_changed.py --since HEAD~1 --until HEAD --dry-run
+  python3 scripts/render_changed.py --full
+"""
+
+from pathlib import Path, PurePosixPath
+from urllib.parse import unquote, urlsplit
+import argparse, hashlib, json, os, re, subprocess, sys
+
+from configure import (PROJECT_CONFIGS, _match_any, discover_qmd, discovery_rules, load_yaml,
+                       locate_project, read_text, write_text)
+
+ROOT = Path(__file__).resolve().parents[1]
+MANIFEST_VERSION = 1
+GLOBAL_FILES    = ["site-config.yaml", "_metadata.yml"]
+GLOBAL_SUFFIXES = {".scss", ".css"}
+GLOBAL_DIRS     = ["_extensions"]
+SKIP_DIRS       = {"_site", "_freeze", ".quarto", ".git"}
+
+INCLUDE_RE = re.compile(r"\{\{<\s*include\s+([^\s>]+)\s*>\}\}")
+IMAGE_RE   = re.compile(r"!\[[^\]]*\]\(\s*<?([^)\s>]+)")
+SRC_RE     = re.compile(r"""\bsrc\s*=\s*["']([^"']+)["']""", re.I)
+GRAPHIC_RE = re.compile(r"""include_graphics\(\s*["']([^"']+)["']""")
+FM_PATH_RE = re.compile(r"""^\s*(?:-\s*)?(?:[\w-]+\s*:\s*)?["']?([\w./-]+\.[A-Za-z0-9]+)["']?\s*$""", re.M)
+YML_PATH_RE = re.compile(r"""[\w./-]+\.(?:scss|css|html|js|lua|tex|yml|yaml|docx|csl|bib|json)\b""")
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def front_matter(text: str) -> str:
+    if text.startswith("---\n"):
+        end = text.find("\n---", 4)
+        if end != -1:
+            return text[4:end]
+    return ""
+
+def _fm_hash(text: str) -> str:
+    return hashlib.sha256(front_matter(text).encode("utf-8")).hexdigest()
+
+# ---------- Graph ----------
+def _local_ref(ref: str, src: str) -> str | None:
+    """Verweis aus Datei src (relativ zu base) → Pfad relativ zu base; extern/leer → None."""
+    parts = urlsplit(ref.strip())
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    path = unquote(parts.path)
+    joined = path.lstrip("/") if path.startswith("/") else str(PurePosixPath(src).parent / path)
+    norm = os.path.normpath(joined).replace(os.sep, "/")
+    return None if norm.startswith("..") else norm
+
+def file_deps(base: Path, rel: str, seen: set[str] | None = None) -> set[str]:
+    """rel + alles, was rel einbindet (Includes rekursiv, Bilder, Pfade im Front Matter)."""
+    seen = set() if seen is None else seen
+    if rel in seen:
+        return seen
+    seen.add(rel)
+    path = base / rel
+    if not path.is_file() or path.suffix.lower() not in (".qmd", ".md", ".html", ".ipynb"):
+        return seen
+    text = read_text(path)
+    for m in INCLUDE_RE.finditer(text):
+        dep = _local_ref(m.group(1), rel)
+        if dep:
+            file_deps(base, dep, seen)
+    for rx in (IMAGE_RE, SRC_RE, GRAPHIC_RE):
+        for m in rx.finditer(text):
+            dep = _local_ref(m.group(1), rel)
+            if dep:
+                seen.add(dep)
+    for m in FM_PATH_RE.finditer(front_matter(text)):
+        dep = _local_ref(m.group(1), rel)
+        if dep and (base / dep).is_file():
+            seen.add(dep)
+    return seen
+
+def build_graph(base: Path) -> dict[str, set[str]]:
+    """Seite (relativ zu base) → Menge ihrer Abhängigkeiten (inkl. Seite selbst)."""
+    graph = {}
+    for path in discover_qmd(base)[0]:
+        rel = path.relative_to(base).as_posix()
+        if any(part.startswith("_") for part in rel.split("/")):
+            continue   # _*.qmd sind Includes, keine Seiten
+        deps = file_deps(base, rel)
+        parent = PurePosixPath(rel).parent
+        while parent != PurePosixPath("."):   # Ordner-Metadaten gelten für alle Seiten darunter
+            if (base / parent / "_metadata.yml").exists():
+                deps.add(f"{parent}/_metadata.yml")
+            parent = parent.parent
+        graph[rel] = deps
+    return graph
+
+def project_configs(base: Path) -> list[str]:
+    names = set(PROJECT_CONFIGS) | {p.name for p in base.glob("_quarto-*.yml")}
+    return sorted(n for n in names if (base / n).exists())
+
+def global_deps(base: Path) -> set[str]:
+    """Dateien, deren Änderung alle Seiten betrifft."""
+    out = set(project_configs(base)) | set(GLOBAL_FILES)
+    for name in project_configs(base):
+        for m in YML_PATH_RE.finditer(read_text(base / name)):
+            dep = _local_ref(m.group(0), name)
+            if dep and (base / dep).is_file():
+                out.add(dep)
+    return out
+
+def ignored_dirs(base: Path) -> set[str]:
+    """Output-Verzeichnisse aller Profile + Build-Ordner: Änderungen darin zählen nicht."""
+    out = set(SKIP_DIRS)
+    for name in project_configs(base):
+        proj = load_yaml(base / name).get("project") or {}
+        if isinstance(proj, dict) and proj.get("output-dir"):
+            out.add(str(proj["output-dir"]).strip("./"))
+    return out
+
+# ---------- Änderungen ----------
+def _git(base: Path, *args: str) -> str:
+    return subprocess.run(["git", *args], cwd=base, capture_output=True, text=True, check=True).stdout
+
+def changes_from_git(base: Path, since: str, until: str | None = None) -> tuple[set[str], set[str], set[str]]:
+    """
+    (geänderte Dateien, hinzugefügte/gelöschte/umbenannte Dateien, Seiten mit geändertem Front
+    Matter) relativ zu base. Ohne until: Diff since ↔ Arbeitsbaum plus untracked. Mit until: nur
+    der Commit-Bereich since..until — Änderungen, die die Pipeline selbst im Arbeitsbaum macht
+    (configure.py, optimize_images.py), zählen dann nicht.
+    """
+    top = Path(_git(base, "rev-parse", "--show-toplevel").strip())
+    prefix = base.resolve().relative_to(top.resolve()).as_posix()
+    prefix = "" if prefix == "." else prefix + "/"
+    changed, structural, fm = set(), set(), set()
+    lines = _git(base, "diff", "--name-status", "--no-renames", since, *([until] if until else []), "--").splitlines()
+    if not until:
+        lines += ["A\t" + p for p in _git(base, "ls-files", "--others", "--exclude-standard", "--full-name").splitlines()]
+    for line in lines:
+        status, path = line.split("\t", 1)
+        if not path.startswith(prefix):
+            continue
+        rel = path[len(prefix):]
+        changed.add(rel)
+        if status[0] in "AD":
+            structural.add(rel)
+        elif rel.endswith(".qmd"):
+            try:
+                old = _git(base, "show", f"{since}:{path}")
+                new = _git(base, "show", f"{until}:{path}") if until else read_text(base / rel)
+            except subprocess.CalledProcessError:
+                structural.add(rel)
+                continue
+            if _fm_hash(old) != _fm_hash(new):
+                fm.add(rel)
+    return changed, structural, fm
+
+def load_manifest(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if data.get("version") == MANIFEST_VERSION else {}
+
+def snapshot(base: Path, graph: dict[str, set[str]], globals_: set[str]) -> dict:
+    files = {}
+    for rel in sorted(set().union(*graph.values(), globals_)):
+        if (base / rel).is_file():
+            files[rel] = _sha256_file(base / rel)
+    fm = {page: _fm_hash(read_text(base / page)) for page in graph}
+    return {"version": MANIFEST_VERSION, "pages": sorted(graph), "files": files, "fm": fm}
+
+def changes_from_manifest(snap: dict, old: dict) -> tuple[set[str], set[str], set[str]]:
+    """(geänderte Dateien, strukturelle Änderungen, Seiten mit geändertem Front Matter)."""
+    changed = {f for f in snap["files"].keys() | old["files"].keys()
+               if snap["files"].get(f) != old["files"].get(f)}
+    structural = set(snap["pages"]) ^ set(old["pages"])
+    fm = {p for p in snap["pages"] if old.get("fm", {}).get(p) not in (None, snap["fm"][p])}
+    return changed, structural, fm
+
+# ---------- Plan ----------
+def _ignored(rel: str, patterns: list[str]) -> bool:
+    """Wie discover_qmd: Datei selbst oder eines ihrer Elternverzeichnisse (dort 'dir/'-Muster) passt."""
+    parts = rel.split("/")
+    return _match_any(rel, False, patterns) or any(
+        _match_any("/".join(parts[:i]), True, patterns) for i in range(1, len(parts)))
+
+def plan(base: Path, graph: dict[str, set[str]], globals_: set[str], changed: set[str],
+         structural: set[str], fm_changed: set[str]) -> tuple[list[str] | None, str]:
+    """Rückgabe: (zu rendernde Seiten oder None = vollständig, Begründung)."""
+    ignore, skip = discovery_rules(base)["ignore"], ignored_dirs(base)
+    relevant = {rel for rel in changed
+                if rel.split("/")[0] not in skip and not any(p.startswith(".") for p in rel.split("/"))
+                and not _ignored(rel, ignore)}
+
+    for rel in sorted(relevant):
+        if rel in globals_ or PurePosixPath(rel).suffix in GLOBAL_SUFFIXES \
+                or rel.split("/")[0] in GLOBAL_DIRS:
+            return None, f"globale Abhängigkeit geändert: {rel}"
+    pages_changed = {r for r in structural & relevant
+                     if r.endswith(".qmd") and not any(p.startswith("_") for p in r.split("/"))}
+    if pages_changed:
+        return None, f"Seiten hinzugefügt/entfernt: {', '.join(sorted(pages_changed))}"
+    if fm_changed:
+        return None, f"Front Matter geändert (Navigation): {', '.join(sorted(fm_changed))}"
+
+    targets = sorted(p for p, deps in graph.items() if deps & relevant)
+    known = set().union(*graph.values()) if graph else set()
+    unknown = sorted(r for r in relevant if r not in known)
+    if unknown:
+        return None, f"nicht zuordenbare Änderung: {', '.join(unknown[:5])}"
+    return targets, f"{len(relevant)} geänderte Dateien → {len(targets)} Seiten"
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Render only the pages affected by changed sources.",
+                                epilog="Arguments after -- are passed to quarto render.")
+    p.add_argument("--since", default=None, metavar="REF", help="Änderungen per git diff REF ermitteln")
+    p.add_argument("--until", default=None, metavar="REF",
+                   help="mit --since: nur Commits since..REF vergleichen, Arbeitsbaum ignorieren (CI)")
+    p.add_argument("--full", action="store_true", help="immer vollständig rendern")
+    p.add_argument("--dry-run", action="store_true", help="nur den Plan ausgeben")
+    p.add_argument("--quarto", default="quarto", help="Quarto-Binary (Default: quarto)")
+    argv = sys.argv[1:] if argv is None else argv
+    extra = argv[argv.index("--") + 1:] if "--" in argv else []
+    a = p.parse_args(argv[:argv.index("--")] if "--" in argv else argv)
+
+    base = locate_project(ROOT)
+    if base is None:
+        print("❌ _quarto.yml not found (root or ./template).")
+        return 1
+    graph = build_graph(base)
+    globals_ = global_deps(base)
+    snap = snapshot(base, graph, globals_)
+    manifest_path = base / ".quarto" / "render-manifest.json"
+
+    targets, why = None, "vollständiger Render angefordert"
+    if not a.full:
+        if a.since and a.since.strip("0"):
+            try:
+                changed, structural, fm = changes_from_git(base, a.since, a.until)
+            except (subprocess.CalledProcessError, OSError, ValueError):
+                changed = None
+                why = f"git diff {a.since} nicht möglich"
+            if changed is not None:
+                targets, why = plan(base, graph, globals_, changed, structural, fm & graph.keys())
+        elif a.since:
+            why = "kein Vergleichs-Commit (neuer Branch)"
+        else:
+            old = load_manifest(manifest_path)
+            if old:
+                targets, why = plan(base, graph, globals_, *changes_from_manifest(snap, old))
+            else:
+                why = "kein Manifest"
+
+    if targets is None:
+        cmd = [a.quarto, "render", ".", *extra]
+        print(f"🔨 vollständiger Render ({why})")
+    elif not targets:
+        print(f"✅ nichts zu rendern ({why})")
+        cmd = None
+    else:
+        cmd = [a.quarto, "render", *targets, *extra]
+        print(f"🔨 {why}:")
+        for t in targets:
+            print(f"   {t}")
+    if a.dry_run:
+        if cmd:
+            print("   $ " + " ".join(cmd))
+        return 0
+    if cmd:
+        try:
+            rc = subprocess.run(cmd, cwd=base).returncode
+        except FileNotFoundError:
+            print(f"❌ {a.quarto} nicht gefunden.")
+            return 1
+        if rc != 0:
+            return rc
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    write_text(manifest_path, json.dumps(snap, indent=1) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
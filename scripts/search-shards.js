@@ -0,0 +1,82 @@
+// search-shards.js — lädt den Quarto-Suchindex in Shards statt als ein search.json.
+//
+// Wird von scripts/search_shards.py nach site_libs/quarto-search/ kopiert und in jede Seite
+// direkt nach quarto-search.js eingebunden. Ablauf:
+//   1. fetch("…/search.json") liefert sofort [] → Quarto legt einen leeren Fuse-Index an
+//   2. vor jeder Suche im Hauptindex werden die Shards nachgeladen, deren Bigramm-Filter
+//      (search/manifest.json) die Anfrage enthalten kann, und per fuse.add() ergänzt
+// Fehlt das Manifest, bleibt alles beim Original (search.json wird normal geladen).
+(function () {
+  "use strict";
+  var script = document.currentScript;
+  if (!script || !window.Fuse || !window.fetch) return;
+  var root = script.src.replace(/site_libs\/quarto-search\/search-shards\.js(\?.*)?$/, "");
+  var origFetch = window.fetch.bind(window);
+  var manifest = null;
+  var loaded = {};
+
+  function getManifest() {
+    if (manifest === null) {
+      manifest = origFetch(root + "search/manifest.json")
+        .then(function (r) { return r.ok ? r.json() : undefined; })
+        .then(function (m) {
+          if (!m || m.version !== 1) return undefined;
+          m.shards.forEach(function (s) { s.bits = decode(s.filter); });
+          return m;
+        })
+        .catch(function () { return undefined; });
+    }
+    return manifest;
+  }
+
+  function decode(b64) {
+    var raw = atob(b64), out = new Uint8Array(raw.length);
+    for (var i = 0; i < raw.length; i++) out[i] = raw.charCodeAt(i);
+    return out;
+  }
+
+  // muss zu search_shards.py::_bigrams passen (UTF-16-Codeeinheiten, Kleinschreibung)
+  function bigrams(text, size) {
+    var s = text.toLowerCase().replace(/\s+/g, " ").trim(), out = {};
+    for (var i = 0; i < s.length - 1; i++) out[(s.charCodeAt(i) * 31 + s.charCodeAt(i + 1)) % size] = true;
+    return Object.keys(out);
+  }
+
+  function wanted(m, query) {
+    var grams = bigrams(query, m.bits);
+    if (!grams.length) return [];   // < 2 Zeichen: nur bereits geladene Shards durchsuchen
+    var need = grams.length - Math.floor(grams.length / 5);   // Toleranz für Tippfehler (Fuse ist unscharf)
+    return m.shards.filter(function (s) {
+      if (loaded[s.id]) return false;
+      var hits = 0;
+      grams.forEach(function (g) { if (s.bits[g >> 3] & (1 << (g & 7))) hits++; });
+      return hits >= need;
+    });
+  }
+
+  window.fetch = function (input, init) {
+    var url = typeof input === "string" ? input : (input && input.url) || "";
+    if (!/(^|\/)search\.json([?#].*)?$/.test(url)) return origFetch(input, init);
+    return getManifest().then(function (m) {
+      if (!m) return origFetch(input, init);
+      return new Response("[]", { status: 200, headers: { "Content-Type": "application/json" } });
+    });
+  };
+
+  var origSearch = window.Fuse.prototype.search;
+  window.Fuse.prototype.search = function (query, options) {
+    var fuse = this;
+    if (fuse !== window.fuseIndex) return origSearch.call(fuse, query, options);   // Sub-Index
+    return getManifest().then(function (m) {
+      if (!m) return origSearch.call(fuse, query, options);
+      var shards = wanted(m, String(query));
+      return Promise.all(shards.map(function (s) {
+        loaded[s.id] = loaded[s.id] || origFetch(root + "search/" + s.file)
+          .then(function (r) { return r.json(); })
+          .then(function (docs) { docs.forEach(function (d) { fuse.add(d); }); })
+          .catch(function () { delete loaded[s.id]; });
+        return loaded[s.id];
+      })).then(function () { return origSearch.call(fuse, query, options); });
+    });
+  };
+})();
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+search_shards.py — zerlegt Quartos search.json in Shards je Abschnitt, damit die erste Suche
+nicht den ganzen Index laden muss.
+
+• Shards: ein Shard je oberstem Ordner der Seiten-URL (session-1/, base/, …; Startseite → _root),
+    große Abschnitte werden auf --shard-size (Default 64 KB) aufgeteilt → search/<id>.json
+• Manifest (search/manifest.json): je Shard ein Bigramm-Filter (Bitfeld, base64) über
+    title/section/text → der Client lädt nur Shards, die die Anfrage enthalten können
+• Client-Loader (scripts/search-shards.js → site_libs/quarto-search/): wird in jede Seite nach
+    quarto-search.js eingebunden, fängt den search.json-Abruf ab und füllt Quartos Fuse-Index
+    pro Suche mit den passenden Shards nach
+• search.json selbst bleibt liegen (Fallback ohne Manifest, externe Tools); komprimiert werden
+    die Shards von postrender.py (.gz/.br), das diese Stufe vor dem Minify aufruft
+
+Beispiele:
+  python3 scripts/search_shards.py                 # docs/
+  python3 scripts/search_shards.py --dir _site --shard-size 32768
+"""
+
+from pathlib import Path
+import argparse, base64, json, os, re, sys
+
+from configure import locate_project, write_bytes, write_text
+
+ROOT = Path(__file__).resolve().parents[1]
+LOADER_SRC = Path(__file__).with_name("search-shards.js")
+LOADER_REL = "site_libs/quarto-search/search-shards.js"
+SHARD_DIR = "search"
+FILTER_BITS = 4096          # 512 Bytes je Shard; muss zu m.bits im Loader passen (steht im Manifest)
+MANIFEST_VERSION = 1
+
+QUARTO_SEARCH_RE = re.compile(r'<script src="([^"]*)site_libs/quarto-search/quarto-search\.js"></script>')
+_WS_RE = re.compile(r"\s+")
+_ID_RE = re.compile(r"[^A-Za-z0-9_-]+")
+
+# ---------- Filter ----------
+def _bigrams(text: str, bits: int) -> set[int]:
+    """Bigramme wie im Loader: Kleinschreibung, Whitespace → ein Leerzeichen, UTF-16-Codeeinheiten."""
+    s = _WS_RE.sub(" ", text.lower()).strip().encode("utf-16-le")
+    units = [int.from_bytes(s[i:i + 2], "little") for i in range(0, len(s), 2)]
+    return {(a * 31 + b) % bits for a, b in zip(units, units[1:])}
+
+def bigram_filter(docs: list[dict], bits: int = FILTER_BITS) -> str:
+    field = bytearray(bits // 8)
+    for doc in docs:
+        # getrennt je Feld: Fuse sucht pro Schlüssel, Bigramme über Feldgrenzen wären nur Rauschen
+        for key in ("title", "section", "text"):
+            for g in _bigrams(str(doc.get(key) or ""), bits):
+                field[g >> 3] |= 1 << (g & 7)
+    return base64.b64encode(bytes(field)).decode("ascii")
+
+# ---------- Shards ----------
+def _section(href: str) -> str:
+    path = href.split("#", 1)[0].lstrip("/")
+    head = path.split("/", 1)[0] if "/" in path else "_root"
+    return _ID_RE.sub("-", head) or "_root"
+
+def _dump(docs: list[dict]) -> bytes:
+    return json.dumps(docs, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def build_shards(docs: list[dict], shard_size: int) -> dict[str, list[dict]]:
+    """Abschnitt → Dokumente (Reihenfolge aus search.json), Abschnitte > shard_size aufgeteilt."""
+    sections: dict[str, list[dict]] = {}
+    for doc in docs:
+        sections.setdefault(_section(str(doc.get("href", ""))), []).append(doc)
+    shards: dict[str, list[dict]] = {}
+    for name, members in sections.items():
+        part, size, n = [], 0, 0
+        for doc in members:
+            cost = len(_dump([doc]))
+            if part and size + cost > shard_size:
+                shards[f"{name}-{n}"] = part
+                part, size, n = [], 0, n + 1
+            part.append(doc)
+            size += cost
+        shards[f"{name}-{n}" if n else name] = part
+    return shards
+
+# ---------- Seiten ----------
+def inject_loader(out_dir: Path) -> int:
+    """Loader-Tag nach quarto-search.js einfügen (idempotent); Rückgabe: geänderte Seiten."""
+    changed = 0
+    for path in sorted(out_dir.rglob("*.html")):
+        text = path.read_bytes().decode("utf-8", "surrogateescape")
+        if LOADER_REL in text:
+            continue
+        new = QUARTO_SEARCH_RE.sub(lambda m: m.group(0) + f'\n<script src="{m.group(1)}{LOADER_REL}"></script>', text, 1)
+        if new != text:
+            changed += bool(write_bytes(path, new.encode("utf-8", "surrogateescape")))
+    return changed
+
+def prune_shards(shard_dir: Path, keep: set[str]) -> int:
+    """Shards (samt .gz/.br) entfernen, die nicht mehr im Manifest stehen."""
+    removed = 0
+    for path in shard_dir.iterdir():
+        stem = path.name.split(".json", 1)[0] + ".json"
+        if path.is_file() and stem not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+# ---------- Lauf ----------
+def shard_search(out_dir: Path, shard_size: int = 64 * 1024) -> bool:
+    """Eine Stufe über out_dir; False, wenn es keinen Suchindex gibt (Suche abgeschaltet)."""
+    index = out_dir / "search.json"
+    if not index.is_file() or not (out_dir / "site_libs" / "quarto-search").is_dir():
+        print(f"🔎 kein search.json in {out_dir} → Sharding übersprungen")
+        return False
+    docs = json.loads(index.read_text(encoding="utf-8"))
+    shards = build_shards(docs, shard_size)
+
+    shard_dir = out_dir / SHARD_DIR
+    shard_dir.mkdir(exist_ok=True)
+    entries, written, largest = [], 0, 0
+    for sid, members in shards.items():
+        blob = _dump(members)
+        largest = max(largest, len(blob))
+        written += bool(write_bytes(shard_dir / f"{sid}.json", blob))
+        entries.append({"id": sid, "file": f"{sid}.json", "docs": len(members), "bytes": len(blob),
+                        "filter": bigram_filter(members)})
+    manifest = {"version": MANIFEST_VERSION, "bits": FILTER_BITS, "shards": entries}
+    written += bool(write_text(shard_dir / "manifest.json",
+                               json.dumps(manifest, ensure_ascii=False, separators=(",", ":"))))
+    removed = prune_shards(shard_dir, {e["file"] for e in entries} | {"manifest.json"})
+    written += bool(write_bytes(out_dir / LOADER_REL, LOADER_SRC.read_bytes()))
+    pages = inject_loader(out_dir)
+
+    full = index.stat().st_size
+    head = (shard_dir / "manifest.json").stat().st_size
+    print(f"🔎 search.json ({full/1024:.0f} KB, {len(docs)} Einträge) → {len(shards)} Shards,"
+          f" größter {largest/1024:.0f} KB, Manifest {head/1024:.1f} KB")
+    print(f"   {written} Dateien geschrieben, Loader in {pages} Seiten eingebunden"
+          + (f", {removed} veraltete Shards entfernt" if removed else ""))
+    return True
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Split Quarto's search.json into per-section shards with a client loader.")
+    p.add_argument("--dir", default=None,
+                   help="Output-Verzeichnis (Default: $QUARTO_PROJECT_OUTPUT_DIR, sonst docs/)")
+    p.add_argument("--shard-size", type=int, default=64 * 1024, help="Obergrenze je Shard in Bytes (Default: 65536)")
+    a = p.parse_args(argv)
+
+    base = locate_project(ROOT) or ROOT
+    out_dir = Path(a.dir or os.environ.get("QUARTO_PROJECT_OUTPUT_DIR") or base / "docs").absolute()
+    if not out_dir.is_dir():
+        print(f"❌ Output-Verzeichnis nicht gefunden: {out_dir}")
+        return 1
+    shard_search(out_dir, a.shard_size)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+theme_cache.py — Schlüssel für den Theme-Build-Cache (kompiliertes Bootstrap/lumen-SCSS).
+
+Quarto kompiliert den ganzen Bootstrap/lumen-Stack samt css/custom.scss bzw. css/theme-dark.scss
+und legt das CSS in seinem SASS-Cache ab (Linux: ~/.cache/quarto/sass, Schlüssel = komplette
+SCSS-Eingabe). Lokal teilen sich alle Kurs-Sites diesen Cache; auf CI-Runnern ist er bei jedem Lauf
+leer → jeder Render kompiliert neu, auch wenn sich am Branding nichts geändert hat.
+
+• Schlüssel = SHA-256 über brand_hex, brand_hex_dark, brand_font, dark_theme, alle css/*.scss,
+    den theme:-Block aus _quarto.yml (light/dark-Stacks) und die Quarto-Version
+• CI: actions/cache stellt Quartos SASS-Cache unter diesem Schlüssel wieder her → gleiches Branding
+    (auch aus einem früheren Lauf mit anderem Inhalt) = Treffer, Quarto überspringt die Kompilierung
+• .quarto/theme-cache.json merkt sich Schlüssel + Eingaben des letzten Laufs → Meldung, was sich am
+    Theme geändert hat
+• Fertiges CSS direkt als theme: einzubinden geht nicht: Quarto nimmt dort nur SCSS/Theme-Namen,
+    ein vorkompiliertes Stylesheet verlöre Navbar-, Dark-Umschalter- und Bootstrap-Integration
+
+Beispiele:
+  python3 scripts/theme_cache.py                    # Schlüssel + Änderungen seit letztem Lauf
+  python3 scripts/theme_cache.py --key              # nur den Schlüssel ausgeben
+  python3 scripts/theme_cache.py --github-output    # key=…/dir=… nach $GITHUB_OUTPUT (CI)
+"""
+
+from pathlib import Path
+import argparse, hashlib, json, os, shutil, subprocess, sys
+
+from configure import (THEME_PATH, YamlDoc, default_config_path, load_yaml, locate_project,
+                       read_text, write_text)
+
+ROOT = Path(__file__).resolve().parents[1]
+THEME_KEYS = ("brand_hex", "brand_hex_dark", "brand_font", "dark_theme")
+STATE_VERSION = 1
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+# ---------- Eingaben ----------
+def quarto_version(quarto: str = "quarto") -> str:
+    """Version der Quarto-CLI ("" ohne Quarto); ein Update verwirft deren SASS-Cache ohnehin."""
+    if shutil.which(quarto) is None:
+        return ""
+    try:
+        return subprocess.run([quarto, "--version"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def theme_block(yml: Path) -> str:
+    """Zeilen des theme:-Blocks aus _quarto.yml (inkl. auskommentierter dark:-Zeile)."""
+    if not yml.exists():
+        return ""
+    doc = YamlDoc(read_text(yml))
+    node = doc.node(THEME_PATH)
+    if node is None:
+        return ""
+    return "\n".join(line for line in doc.lines[node.line:node.end] if line is not None).strip()
+
+def theme_inputs(base: Path, cfg: dict, quarto: str = "quarto") -> dict[str, str]:
+    """Name → Wert bzw. SHA-256 aller Eingaben, die das kompilierte Theme bestimmen."""
+    inputs = {k: str(cfg.get(k, "") or "") for k in THEME_KEYS}
+    inputs["_quarto.yml:theme"] = _sha256(theme_block(base / "_quarto.yml").encode("utf-8"))
+    for path in sorted((base / "css").glob("*.scss")):
+        inputs[f"css/{path.name}"] = _sha256(path.read_bytes())
+    inputs["quarto"] = quarto_version(quarto)
+    return inputs
+
+def theme_key(inputs: dict[str, str]) -> str:
+    return _sha256(json.dumps(inputs, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+
+def sass_cache_dir() -> Path:
+    """Quartos SASS-Cache (quartoCacheDir("sass")) je Plattform."""
+    if sys.platform == "win32":
+        return Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local") / "quarto" / "sass"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "quarto" / "sass"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "quarto" / "sass"
+
+def _dir_size(path: Path) -> tuple[int, int]:
+    files = size = 0
+    for dirpath, _, names in os.walk(path):
+        for name in names:
+            try:
+                size += os.stat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                continue
+            files += 1
+    return files, size
+
+# ---------- Lauf ----------
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Compute the theme build cache key for Quarto's compiled SCSS.")
+    p.add_argument("-c", "--config", default=None, help="Pfad zur site-config.yaml")
+    p.add_argument("--key", action="store_true", help="nur den Schlüssel ausgeben")
+    p.add_argument("--github-output", action="store_true",
+                   help="key=… und dir=… an $GITHUB_OUTPUT anhängen (GitHub Actions)")
+    p.add_argument("--quarto", default="quarto", help="Quarto-Binary (Default: quarto)")
+    a = p.parse_args(argv)
+
+    base = locate_project(ROOT)
+    if base is None:
+        print("❌ _quarto.yml not found (root or ./template).")
+        return 1
+    cfg_path = Path(a.config) if a.config else default_config_path(ROOT, base)
+    cfg = load_yaml(cfg_path) if cfg_path.exists() else {}
+    inputs = theme_inputs(base, cfg, a.quarto)
+    key = theme_key(inputs)
+    cache_dir = sass_cache_dir()
+
+    if a.github_output:
+        out = os.environ.get("GITHUB_OUTPUT")
+        if not out:
+            print("❌ $GITHUB_OUTPUT nicht gesetzt")
+            return 1
+        with open(out, "a", encoding="utf-8") as f:
+            f.write(f"key={key}\ndir={cache_dir}\n")
+    if a.key:
+        print(key)
+        return 0
+
+    state_path = base / ".quarto" / "theme-cache.json"
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+    old = state.get("inputs", {}) if state.get("version") == STATE_VERSION else {}
+    if old and state.get("key") == key:
+        print(f"🎨 Theme-Schlüssel {key[:12]}… unverändert seit dem letzten Lauf")
+    else:
+        diff = sorted(k for k in inputs.keys() | old.keys() if inputs.get(k) != old.get(k))
+        print(f"🎨 Theme-Schlüssel {key[:12]}…" + (f" geändert: {', '.join(diff)}" if old else " (erster Lauf)"))
+    if cache_dir.is_dir():
+        files, size = _dir_size(cache_dir)
+        print(f"   SASS-Cache: {cache_dir} ({files} Dateien, {size/1e6:.1f} MB)")
+    else:
+        print(f"   SASS-Cache: {cache_dir} (noch leer)")
+
+    state_path.parent.mkdir(exist_ok=True)
+    write_text(state_path, json.dumps({"version": STATE_VERSION, "key": key, "inputs": inputs},
+                                      indent=2, ensure_ascii=False) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())